@@ -0,0 +1,155 @@
+import argparse
+import json
+import sys
+import threading
+import uuid
+from config.settings import settings
+from core.async_engine import create_engine
+from core.checked_index import checked_index
+from core.engine import live_platforms
+from utils.database import db
+
+PLATFORMS = ("pinterest", "github", "instagram")
+
+
+def iter_usernames(path: str):
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            username = line.strip()
+            if username and not username.startswith('#'):
+                yield username
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def format_result(data: dict, fmt: str) -> str:
+    if fmt == "jsonl":
+        return json.dumps(data, ensure_ascii=False)
+
+    available = data.get("available_on", [])
+    possibly_available = data.get("possibly_available", [])
+    if available:
+        status = "Available on: " + ", ".join(p.upper() for p in available)
+    elif possibly_available:
+        status = "Possibly available on: " + ", ".join(p.upper() for p in possibly_available)
+    else:
+        status = "Taken"
+    return f"[{data['timestamp']}] {data['username']:<15} | {status}"
+
+
+def apply_overrides(args):
+    if args.platforms:
+        enabled = {p.strip().lower() for p in args.platforms.split(",") if p.strip()}
+        unknown = enabled - set(PLATFORMS)
+        if unknown:
+            raise SystemExit(f"Unknown platforms: {', '.join(sorted(unknown))}")
+        for platform in PLATFORMS:
+            settings.override(f"platforms.{platform}", platform in enabled)
+    if args.engine:
+        settings.override("engine", args.engine)
+    if args.threads:
+        settings.override("threads", args.threads)
+        if (args.engine or settings.get("engine")) == "async":
+            settings.override("async_concurrency", args.threads)
+    if args.processes:
+        settings.override("processes", args.processes)
+    if args.use_proxies:
+        settings.override("use_proxies", True)
+    if args.no_cache:
+        settings.override("result_cache.enabled", False)
+
+
+def run(args) -> int:
+    if args.compact_db:
+        db.compact()
+        db.close()
+        print("History database compacted", file=sys.stderr)
+        return 0
+
+    apply_overrides(args)
+
+    save = bool(args.save or args.session)
+    completed = None
+    session_id = args.session
+    if save:
+        session_id = session_id or str(uuid.uuid4())
+        completed = db.get_completed_checks(session_id)
+        if not completed:
+            db.create_session(session_id, {
+                'platforms': [p for p in PLATFORMS if settings.get(f"platforms.{p}")],
+                'use_proxies': bool(settings.get("use_proxies")),
+                'source': 'cli'
+            })
+        print(f"Session ID: {session_id}", file=sys.stderr)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    lock = threading.Lock()
+    counts = {"checked": 0, "available": 0}
+
+    def handle(data):
+        available = data.get("available_on", [])
+        possibly_available = data.get("possibly_available", [])
+        with lock:
+            counts["checked"] += 1
+            if available:
+                counts["available"] += 1
+            checked = live_platforms(data)
+            if save and checked:
+                db.save_check_result(
+                    data['username'],
+                    checked,
+                    live_platforms(data, available if available else possibly_available),
+                    session_id
+                )
+            if args.available_only and not (available or possibly_available):
+                return
+            out.write(format_result(data, args.format) + "\n")
+            out.flush()
+
+    usernames = iter_usernames(args.input)
+    if args.skip_checked:
+        checked_index.refresh()
+        usernames = checked_index.filter_unchecked(usernames, [p for p in PLATFORMS if settings.get(f"platforms.{p}")])
+
+    engine = create_engine()
+    try:
+        engine.start_bulk(usernames, handle, completed)
+    except KeyboardInterrupt:
+        engine.stop()
+        return 130
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if save:
+            db.update_session_stats(session_id, counts["checked"], counts["available"])
+            if engine.active:
+                db.end_session(session_id)
+        db.close()
+
+    print(f"Checked: {counts['checked']} - Available: {counts['available']}", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Check username availability without the GUI")
+    parser.add_argument("input", nargs="?", default="-", help="File with one username per line (default: stdin)")
+    parser.add_argument("--output", "-o", default="-", help="File to append results to (default: stdout)")
+    parser.add_argument("--format", "-f", choices=["jsonl", "text"], default="jsonl", help="Output format")
+    parser.add_argument("--platforms", "-p", help="Comma separated platforms to check (default: from settings.json)")
+    parser.add_argument("--engine", "-e", choices=["thread", "async"], help="Checking engine to use")
+    parser.add_argument("--threads", "-t", type=int, help="Concurrent checks per process (sets async_concurrency for the async engine)")
+    parser.add_argument("--processes", "-P", type=int, help="Number of worker processes")
+    parser.add_argument("--use-proxies", action="store_true", help="Rotate through proxies.txt")
+    parser.add_argument("--no-cache", action="store_true", help="Always check live, ignoring recent results")
+    parser.add_argument("--skip-checked", action="store_true", help="Skip usernames ever checked before on all selected platforms")
+    parser.add_argument("--available-only", "-a", action="store_true", help="Only output available usernames")
+    parser.add_argument("--save", action="store_true", help="Record results in the history database")
+    parser.add_argument("--session", "-s", help="Session ID to record results under; usernames already checked in it are skipped")
+    parser.add_argument("--compact-db", action="store_true", help="Run a full VACUUM on the history database and exit")
+    return parser
+
+
+if __name__ == "__main__":
+    raise SystemExit(run(build_parser().parse_args()))
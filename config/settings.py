@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 
@@ -6,28 +7,89 @@ class Settings:
         self.path = os.path.join("config", "settings.json")
         self.defaults = {
             "threads": 10,
+            "engine": "thread",
+            "async_concurrency": 500,
+            "processes": 1,
+            "adaptive_concurrency": {
+                "enabled": True,
+                "min": 1,
+                "window": 20,
+                "target_p95": 5.0,
+                "max_error_rate": 0.1,
+                "increase": 1,
+                "decrease": 0.5
+            },
+            "result_cache": {
+                "enabled": True,
+                "max_entries": 100000,
+                "ttl": {
+                    "pinterest": {"taken": 86400, "available": 900},
+                    "github": {"taken": 86400, "available": 900},
+                    "instagram": {"taken": 21600, "available": 900}
+                }
+            },
+            "connection_pool": {
+                "size": 0,
+                "max_proxies": 256
+            },
+            "checked_index": {
+                "enabled": True,
+                "capacity": 1000000,
+                "error_rate": 0.001
+            },
+            "max_body_bytes": 1048576,
+            "database": {
+                "retention_days": 0,
+                "monitor_retention_days": 0,
+                "maintenance_interval": 3600
+            },
             "timeout": 15,
             "webhook_url": "",
             "use_proxies": False,
-            "jitter_min": 0.5,
-            "jitter_max": 1.5,
+            "monitor_fastest_proxies": 5,
+            "instagram_sticky_checks": 25,
+            "rate_limits": {
+                "pinterest": {"rate": 5, "burst": 10},
+                "github": {"rate": 5, "burst": 10},
+                "instagram": {"rate": 1, "burst": 3}
+            },
+            "proxy_health": {
+                "smoothing": 0.2,
+                "failures_before_cooldown": 2,
+                "cooldown": 30,
+                "max_cooldown": 600
+            },
+            "proxy_check": {
+                "concurrency": 1000,
+                "connect_timeout": 3,
+                "timeout": 8,
+                "samples": 3,
+                "max_age": 21600,
+                "test_url": "https://httpbin.org/ip"
+            },
             "platforms": {
                 "pinterest": True,
                 "instagram": True,
                 "github": True
             }
         }
+        self.overrides = {}
         self.data = self.load()
 
     def load(self):
-        if not os.path.exists(self.path):
-            return self.defaults.copy()
-        try:
-            with open(self.path, 'r', encoding='utf-8') as f:
-                loaded = json.load(f)
-                return {**self.defaults, **loaded}
-        except Exception:
-            return self.defaults.copy()
+        data = self.defaults.copy()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                    data = {**self.defaults, **loaded}
+            except Exception:
+                pass
+        if self.overrides:
+            data = copy.deepcopy(data)
+            for key, value in self.overrides.items():
+                self._assign(data, key, value)
+        return data
 
     def save(self):
         try:
@@ -49,12 +111,19 @@ class Settings:
                 return default
         return val
 
-    def set(self, key, value):
+    def _assign(self, target, key, value):
         keys = key.split('.')
-        target = self.data
         for k in keys[:-1]:
             target = target.setdefault(k, {})
         target[keys[-1]] = value
+
+    def set(self, key, value):
+        self._assign(self.data, key, value)
         self.save()
 
+    def override(self, key, value):
+        self.overrides[key] = value
+        self.data = copy.deepcopy(self.data)
+        self._assign(self.data, key, value)
+
 settings = Settings()
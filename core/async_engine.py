@@ -0,0 +1,201 @@
+import asyncio
+from core.engine import AuditEngine
+from core.concurrency import concurrency_controller
+from core.rate_limiter import rate_limiter
+from core.platforms import CHECK_ERROR, DRAIN_MAX_BYTES
+from config.settings import settings
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+
+class AsyncHttpClient:
+    def __init__(self, limit: int = 0):
+        self.limit = limit
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.limit, ttl_dns_cache=300)
+        # Cookies are per check (see the cookies argument of fetch), never shared across proxies
+        self.session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, url, headers=None, timeout=10, proxies=None, scanner_factory=None, cookies=None):
+        proxy = None
+        if proxies:
+            proxy = proxies.get("https") or proxies.get("http")
+            if proxy and proxy.startswith("socks"):
+                raise ValueError("socks proxies are not supported by the async engine")
+
+        async with self.session.get(
+            url,
+            headers=headers,
+            proxy=proxy,
+            cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            if cookies is not None:
+                cookies.update({name: morsel.value for name, morsel in response.cookies.items()})
+            scanner = scanner_factory(response.status, str(response.url), response.charset) if scanner_factory else None
+            if scanner is None:
+                await self.finish(response)
+                return response.status, str(response.url), ""
+            async for chunk in response.content.iter_chunked(scanner.chunk_size):
+                if scanner.feed(chunk):
+                    break
+            await self.finish(response)
+            return response.status, str(response.url), scanner.text
+
+    async def finish(self, response):
+        # A short remainder of known length is drained so the connection can be reused; anything else is dropped
+        length = response.content_length
+        if length is not None and length - response.content.total_bytes <= DRAIN_MAX_BYTES:
+            try:
+                while await response.content.readany():
+                    pass
+                response.release()
+                return
+            except Exception:
+                pass
+        response.close()
+
+
+class AsyncAuditEngine(AuditEngine):
+    def __init__(self):
+        super().__init__()
+        self.loop = None
+        self.client = None
+        self._bulk_task = None
+
+    async def run_platform_check_async(self, platform, username):
+        # Wait for the rate limit before taking a slot, so throttled tasks don't hold concurrency
+        await rate_limiter.acquire_async(platform)
+        slot = await concurrency_controller.acquire_async(platform)
+        try:
+            return await self.checkers[platform].check_async(self.client, username)
+        finally:
+            concurrency_controller.release(slot)
+
+    async def check_target_async(self, username, settings_data=None, skip_platforms=None):
+        if not self.active:
+            return None
+
+        if settings_data is None:
+            settings_data = self.settings_data
+        result, pending = self.prepare_target(username, settings_data, skip_platforms)
+
+        if pending:
+            checks = [self.run_platform_check_async(platform, username) for platform in pending]
+            outcomes = await asyncio.gather(*checks, return_exceptions=True)
+
+            for platform, check_result in zip(pending, outcomes):
+                if isinstance(check_result, BaseException):
+                    check_result = CHECK_ERROR
+                self.record_check_result(result, platform, check_result)
+
+        self.finish_result(result)
+
+        if result["available_on"] or result.get("possibly_available"):
+            await self.loop.run_in_executor(None, self.dispatch_webhook, result)
+
+        return result
+
+    async def aiter_targets(self, usernames, completed=None):
+        async for username in usernames:
+            target = self.pending_target(username, completed)
+            if target is not None:
+                yield target
+
+    async def _bulk_worker(self, next_target, callback):
+        while True:
+            target = await next_target()
+            if target is None or not self.active:
+                break
+            user, done = target
+            try:
+                data = await self.check_target_async(user, self.settings_data, done)
+                if data:
+                    callback(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+
+    async def _run_bulk(self, usernames, callback, completed=None):
+        concurrency = int(settings.get("async_concurrency") or 500)
+        concurrency_controller.configure(concurrency)
+        if hasattr(usernames, "__aiter__"):
+            # Async sources may wait on I/O, so the workers take turns awaiting them
+            source = self.aiter_targets(usernames, completed)
+            lock = asyncio.Lock()
+
+            async def next_target():
+                async with lock:
+                    try:
+                        return await source.__anext__()
+                    except StopAsyncIteration:
+                        return None
+        else:
+            source = self.iter_targets(usernames, completed)
+
+            async def next_target():
+                return next(source, None)
+
+        async with AsyncHttpClient(limit=concurrency) as client:
+            self.client = client
+            workers = [asyncio.create_task(self._bulk_worker(next_target, callback)) for _ in range(concurrency)]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                self.client = None
+
+    def start_bulk(self, usernames, callback, completed=None):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is required for the async engine")
+
+        self.active = True
+        self.monitor_mode = False
+        self.refresh_settings()
+
+        self.loop = asyncio.new_event_loop()
+        try:
+            self._bulk_task = self.loop.create_task(self._run_bulk(usernames, callback, completed))
+            self.loop.run_until_complete(self._bulk_task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._bulk_task = None
+            self.loop.close()
+            self.loop = None
+
+    def stop(self):
+        self.active = False
+        loop, task = self.loop, self._bulk_task
+        if loop is not None and task is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass
+
+
+def create_engine(allow_processes=True):
+    if allow_processes and int(settings.get("processes") or 1) > 1:
+        from core.process_engine import ProcessAuditEngine
+        return ProcessAuditEngine()
+    if settings.get("engine") == "async" and AIOHTTP_AVAILABLE:
+        return AsyncAuditEngine()
+    return AuditEngine()
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+from config.settings import settings
+from utils.database import db
+
+INDEX_MAGIC = b"UCIDX1\n"
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float, bits: bytearray = None, count: int = 0):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    # Adds a filter of twice the capacity once the newest one is full, so old names are never dropped
+    def __init__(self, capacity: int, error_rate: float, filters: List[BloomFilter] = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filters = filters or [BloomFilter(capacity, error_rate)]
+
+    def add(self, key: str):
+        if key in self:
+            return
+        current = self.filters[-1]
+        if current.full:
+            current = BloomFilter(current.capacity * 2, self.error_rate)
+            self.filters.append(current)
+        current.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in f for f in self.filters)
+
+
+class CheckedIndex:
+    def __init__(self, path: str = os.path.join("data", "checked_index.bin"), loader=None):
+        self.path = path
+        self.loader = loader
+        self.lock = threading.Lock()
+        self.refresher: Optional[threading.Thread] = None
+        self.filters: Dict[str, ScalableBloomFilter] = {}
+        self.last_id = 0
+        self.loaded = False
+
+    def config(self):
+        return settings.get("checked_index") or {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config().get("enabled", True))
+
+    def _new_filter(self) -> ScalableBloomFilter:
+        config = self.config()
+        return ScalableBloomFilter(int(config.get("capacity", 1000000)), float(config.get("error_rate", 0.001)))
+
+    def _load(self):
+        self.loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                if f.readline() != INDEX_MAGIC:
+                    return
+                header = json.loads(f.readline())
+                filters = {}
+                for platform, entry in header["filters"].items():
+                    parts = []
+                    for part in entry["parts"]:
+                        bloom = BloomFilter(part["capacity"], entry["error_rate"], count=part["count"])
+                        bloom.bits = bytearray(f.read(len(bloom.bits)))
+                        parts.append(bloom)
+                    filters[platform] = ScalableBloomFilter(entry["capacity"], entry["error_rate"], parts)
+            self.filters = filters
+            self.last_id = int(header["last_id"])
+        except (OSError, ValueError, KeyError):
+            self.filters = {}
+            self.last_id = 0
+
+    def save(self):
+        with self.lock:
+            header = {
+                "last_id": self.last_id,
+                "filters": {
+                    platform: {
+                        "capacity": index.capacity,
+                        "error_rate": index.error_rate,
+                        "parts": [{"capacity": f.capacity, "count": f.count} for f in index.filters]
+                    }
+                    for platform, index in self.filters.items()
+                }
+            }
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(INDEX_MAGIC)
+                    f.write(json.dumps(header).encode("utf-8") + b"\n")
+                    for index in self.filters.values():
+                        for part in index.filters:
+                            f.write(part.bits)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+    def refresh(self):
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            if self.loader is None:
+                return
+            added = 0
+            while True:
+                rows = self.loader(self.last_id)
+                if not rows:
+                    break
+                for row_id, username, platform in rows:
+                    index = self.filters.get(platform)
+                    if index is None:
+                        index = self.filters[platform] = self._new_filter()
+                    index.add(username.lower())
+                    self.last_id = max(self.last_id, row_id)
+                added += len(rows)
+        if added:
+            self.save()
+
+    def refresh_in_background(self):
+        # Loading a large history can take seconds, so interactive callers never wait on it
+        if not self.enabled or (self.refresher is not None and self.refresher.is_alive()):
+            return
+        self.refresher = threading.Thread(target=self.refresh, name="checked-index", daemon=True)
+        self.refresher.start()
+
+    def is_checked(self, username: str, platforms: Iterable[str]) -> bool:
+        platforms = list(platforms)
+        if not platforms:
+            return False
+        key = username.strip().lower()
+        return all(key in self.filters.get(platform, ()) for platform in platforms)
+
+    def filter_unchecked(self, usernames: Iterable[str], platforms: Iterable[str]):
+        # Filters against what is indexed so far; call refresh() first to include the latest results
+        platforms = list(platforms)
+        if not self.enabled:
+            yield from usernames
+            return
+        for username in usernames:
+            if not self.is_checked(username, platforms):
+                yield username
+
+
+checked_index = CheckedIndex(loader=db.get_platform_results_since)
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Optional
+from config.settings import settings
+
+ERROR_STATUS_CODES = {403, 429}
+
+
+class AdaptiveLimit:
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self.cond = threading.Condition()
+        self.async_waiters = deque()
+        self.samples = deque()
+        self.last_error_rate = 0.0
+        self.last_p95 = 0.0
+
+    def resize(self, initial: int, minimum: int, maximum: int):
+        with self.cond:
+            self.minimum = max(1, minimum)
+            self.maximum = max(self.minimum, maximum)
+            self.limit = float(min(max(initial, self.minimum), self.maximum))
+            self.samples.clear()
+            self._wake()
+
+    def _has_capacity(self):
+        return self.in_flight < int(self.limit)
+
+    def _wake(self):
+        self.cond.notify_all()
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self.async_waiters:
+            waiter = self.async_waiters.popleft()
+            if waiter.done():
+                continue
+            waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+            free -= 1
+
+    def acquire(self):
+        with self.cond:
+            while not self._has_capacity():
+                self.cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.cond:
+                if self._has_capacity():
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self.async_waiters.append(waiter)
+            await waiter
+
+    def release(self):
+        with self.cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._wake()
+
+    def record(self, latency: float, error: bool, window: int, target_p95: float,
+               max_error_rate: float, increase: float, decrease: float):
+        with self.cond:
+            self.samples.append((latency, error))
+            if len(self.samples) < window:
+                return
+
+            latencies = sorted(sample[0] for sample in self.samples)
+            errors = sum(1 for sample in self.samples if sample[1])
+            self.samples.clear()
+
+            self.last_p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.last_error_rate = errors / len(latencies)
+
+            if self.last_error_rate > max_error_rate or self.last_p95 > target_p95:
+                self.limit = max(self.minimum, self.limit * decrease)
+            else:
+                self.limit = min(self.maximum, self.limit + increase)
+                self._wake()
+
+    def snapshot(self):
+        with self.cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "error_rate": self.last_error_rate,
+                "p95": self.last_p95
+            }
+
+
+def _resolve(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ConcurrencyController:
+    def __init__(self):
+        self.limits = {}
+        self.lock = threading.Lock()
+        self.maximum = 10
+        self.active = False
+
+    def bounds(self):
+        config = settings.get("adaptive_concurrency") or {}
+        return (
+            int(config.get("initial", self.maximum)),
+            int(config.get("min", 1)),
+            min(self.maximum, int(config.get("max", self.maximum)))
+        )
+
+    def configure(self, maximum: int):
+        # Limits are resized in place: checks still in flight release the object they acquired
+        with self.lock:
+            self.maximum = max(1, int(maximum))
+            self.active = bool(settings.get("adaptive_concurrency.enabled"))
+            bounds = self.bounds()
+            limits = list(self.limits.values())
+        for limit in limits:
+            limit.resize(*bounds)
+
+    def get(self, platform: str) -> AdaptiveLimit:
+        limit = self.limits.get(platform)
+        if limit is None:
+            with self.lock:
+                limit = self.limits.get(platform)
+                if limit is None:
+                    limit = AdaptiveLimit(*self.bounds())
+                    self.limits[platform] = limit
+        return limit
+
+    def acquire(self, platform: str) -> Optional[AdaptiveLimit]:
+        # Returns the limit to hand back to release(), or None when adaptive concurrency is off
+        if not self.active:
+            return None
+        limit = self.get(platform)
+        limit.acquire()
+        return limit
+
+    async def acquire_async(self, platform: str) -> Optional[AdaptiveLimit]:
+        if not self.active:
+            return None
+        limit = self.get(platform)
+        await limit.acquire_async()
+        return limit
+
+    def release(self, limit: Optional[AdaptiveLimit]):
+        if limit is not None:
+            limit.release()
+
+    def record(self, platform: str, status_code, latency: float):
+        if not self.active:
+            return
+        config = settings.get("adaptive_concurrency") or {}
+        error = status_code is None or status_code in ERROR_STATUS_CODES or status_code >= 500
+        self.get(platform).record(
+            latency,
+            error,
+            int(config.get("window", 20)),
+            float(config.get("target_p95", 5.0)),
+            float(config.get("max_error_rate", 0.1)),
+            float(config.get("increase", 1)),
+            float(config.get("decrease", 0.5))
+        )
+
+    def snapshot(self):
+        with self.lock:
+            limits = dict(self.limits)
+        return {platform: limit.snapshot() for platform, limit in limits.items()}
+
+
+concurrency_controller = ConcurrencyController()
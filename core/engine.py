@@ -1,10 +1,23 @@
 import concurrent.futures
+import itertools
+import threading
 import requests
 import time
 from datetime import datetime
-from core.platforms import PinterestChecker, GitHubChecker, InstagramChecker, ProxyManager
+from core.platforms import PinterestChecker, GitHubChecker, InstagramChecker, ProxyManager, CHECK_ERROR
 from core.validation import Validator
+from core.rate_limiter import rate_limiter, delayed_submitter
+from core.concurrency import concurrency_controller
+from core.result_cache import result_cache
+from core import http_pool
 from config.settings import settings
+from utils.database import db
+
+
+def live_platforms(result, platforms=None):
+    # Cache hits were saved when they were first checked; saving them again would renew them
+    cached = result.get("cached_platforms") or ()
+    return [p for p in (result["checked_platforms"] if platforms is None else platforms) if p not in cached]
 
 
 class AuditEngine:
@@ -16,26 +29,30 @@ class AuditEngine:
         }
         self.validator = Validator()
         self.executor = None
+        self.platform_executor = None
+        self._platform_executor_lock = threading.Lock()
         self.active = False
         self.monitor_mode = False
         self.settings_data = settings.load()
 
     def refresh_settings(self):
         self.settings_data = settings.load()
+        rate_limiter.reload()
+        result_cache.configure()
+        http_pool.configure()
+        db.configure(self.settings_data.get("database") or {})
+        for checker in self.checkers.values():
+            checker.prefer_fast_proxies = self.monitor_mode
 
-    def check_target(self, username, settings_data=None):
-        if not self.active:
-            return None
-
-        if settings_data is None:
-            settings_data = self.settings_data
-        result = {
+    def new_result(self, username):
+        return {
             "username": username,
             "available_on": [],
             "timestamp": datetime.now().strftime("%H:%M:%S"),
             "checked_platforms": []
         }
 
+    def select_platforms(self, username, settings_data):
         platforms_to_check = []
         if settings_data.get("platforms", {}).get("pinterest") and self.validator.check_pinterest(username):
             platforms_to_check.append("pinterest")
@@ -43,27 +60,130 @@ class AuditEngine:
             platforms_to_check.append("github")
         if settings_data.get("platforms", {}).get("instagram") and self.validator.check_instagram(username):
             platforms_to_check.append("instagram")
+        return platforms_to_check
+
+    def prepare_target(self, username, settings_data, skip_platforms=None):
+        result = self.new_result(username)
 
+        platforms_to_check = self.select_platforms(username, settings_data)
+        if skip_platforms:
+            platforms_to_check = [p for p in platforms_to_check if p not in skip_platforms]
         if not platforms_to_check:
-            return result
+            return result, []
 
         result["checked_platforms"] = platforms_to_check
         result["possibly_available"] = []
+        result["failed_platforms"] = []
+        result["cached_platforms"] = []
 
+        pending = []
         for platform in platforms_to_check:
-            try:
-                check_result = self.checkers[platform].check(username)
-                if check_result == "POSSIBLY_AVAILABLE":
-                    result["possibly_available"].append(platform)
-                elif check_result is True:
-                    result["available_on"].append(platform)
-                else:
-                    if check_result is None and len(username) < 4:
-                        result["possibly_available"].append(platform)
-            except Exception:
-                continue
+            cached = None if self.monitor_mode else result_cache.get(username, platform)
+            if cached is None:
+                pending.append(platform)
+            else:
+                result["cached_platforms"].append(platform)
+                self.apply_check_result(result, platform, cached)
+        return result, pending
+
+    def record_check_result(self, result, platform, check_result):
+        self.apply_check_result(result, platform, check_result)
+        if check_result != CHECK_ERROR and not self.monitor_mode:
+            result_cache.put(result["username"], platform, check_result)
+
+    def finish_result(self, result):
+        failed = result.get("failed_platforms")
+        if failed:
+            result["checked_platforms"] = [p for p in result["checked_platforms"] if p not in failed]
+
+    def apply_check_result(self, result, platform, check_result):
+        if check_result == CHECK_ERROR:
+            result["failed_platforms"].append(platform)
+        elif check_result == "POSSIBLY_AVAILABLE":
+            result["possibly_available"].append(platform)
+        elif check_result is True:
+            result["available_on"].append(platform)
+        else:
+            if check_result is None and len(result["username"]) < 4:
+                result["possibly_available"].append(platform)
+
+    def get_platform_executor(self):
+        with self._platform_executor_lock:
+            if self.platform_executor is None:
+                max_workers = int(settings.get("threads") or 10) * len(self.checkers)
+                self.platform_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="platform-check"
+                )
+            return self.platform_executor
+
+    def run_platform_check(self, platform, username):
+        if not self.active:
+            return CHECK_ERROR
+        slot = concurrency_controller.acquire(platform)
+        try:
+            return self.checkers[platform].check(username)
+        except Exception:
+            return CHECK_ERROR
+        finally:
+            concurrency_controller.release(slot)
+
+    def get_metrics(self):
+        return concurrency_controller.snapshot()
+
+    def pending_target(self, username, completed=None):
+        done = completed.get(username) if completed else None
+        if done and all(p in done for p in self.select_platforms(username, self.settings_data)):
+            return None
+        return username, done
+
+    def iter_targets(self, usernames, completed=None):
+        for username in usernames:
+            target = self.pending_target(username, completed)
+            if target is not None:
+                yield target
 
-        if result["available_on"] or result["possibly_available"]:
+    def reserve_tokens(self, platforms):
+        # Tokens are taken before the work is queued, so no check waits for one inside a concurrency slot
+        return max((rate_limiter.reserve(platform) for platform in platforms), default=0.0)
+
+    def check_target(self, username, settings_data=None, skip_platforms=None):
+        if not self.active:
+            return None
+
+        if settings_data is None:
+            settings_data = self.settings_data
+        result, pending = self.prepare_target(username, settings_data, skip_platforms)
+        delay = self.reserve_tokens(pending)
+        if delay > 0:
+            time.sleep(delay)
+        return self.run_target(result, pending)
+
+    def run_target(self, result, pending):
+        if not self.active:
+            return None
+
+        username = result["username"]
+        if pending:
+            first, rest = pending[0], pending[1:]
+            futures = []
+            if rest:
+                executor = self.get_platform_executor()
+                futures = [executor.submit(self.run_platform_check, platform, username) for platform in rest]
+
+            outcomes = [self.run_platform_check(first, username)]
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception:
+                    outcomes.append(CHECK_ERROR)
+
+            for platform, check_result in zip(pending, outcomes):
+                self.record_check_result(result, platform, check_result)
+
+        self.finish_result(result)
+
+        if result["available_on"] or result.get("possibly_available"):
             self.dispatch_webhook(result)
 
         return result
@@ -126,25 +246,47 @@ class AuditEngine:
             except Exception:
                 pass
 
-    def start_bulk(self, usernames, callback):
+    def start_bulk(self, usernames, callback, completed=None):
         self.active = True
         self.monitor_mode = False
         self.refresh_settings()
         max_workers = int(settings.get("threads") or 10)
+        window = max_workers * 2
+        concurrency_controller.configure(max_workers)
+        source = self.iter_targets(usernames, completed)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             self.executor = executor
-            futures = {executor.submit(self.check_target, user, self.settings_data): user for user in usernames}
+            pending = set()
+            exhausted = False
 
-            for future in concurrent.futures.as_completed(futures):
-                if not self.active:
+            while self.active:
+                if not exhausted:
+                    wanted = window - len(pending)
+                    batch = list(itertools.islice(source, wanted))
+                    if len(batch) < wanted:
+                        exhausted = True
+                    for user, done in batch:
+                        result, platforms = self.prepare_target(user, self.settings_data, done)
+                        delay = self.reserve_tokens(platforms)
+                        pending.add(delayed_submitter.submit(delay, executor, self.run_target, result, platforms))
+
+                if not pending:
                     break
-                try:
-                    data = future.result()
-                    if data:
-                        callback(data)
-                except Exception:
-                    pass
+
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    if not self.active:
+                        break
+                    try:
+                        data = future.result()
+                        if data:
+                            callback(data)
+                    except Exception:
+                        pass
+
+            for future in pending:
+                future.cancel()
 
     def start_monitor(self, username, callback, delay=60):
         self.active = True
@@ -162,6 +304,11 @@ class AuditEngine:
                 time.sleep(1)
 
     def stop(self):
+        # Work still queued sees active is False and returns at once; start_bulk cancels its pending futures
         self.active = False
         if self.executor:
             self.executor.shutdown(wait=False)
+        with self._platform_executor_lock:
+            if self.platform_executor:
+                self.platform_executor.shutdown(wait=False)
+                self.platform_executor = None
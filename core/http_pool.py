@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import settings
+
+
+class PooledAdapter(HTTPAdapter):
+    def __init__(self, pool_size: int = 10, max_proxies: int = 256):
+        self.max_proxies = max_proxies
+        self.proxy_lock = threading.Lock()
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.proxy_manager = OrderedDict()
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        with self.proxy_lock:
+            manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+            self.proxy_manager.move_to_end(proxy)
+            while len(self.proxy_manager) > self.max_proxies:
+                _, evicted = self.proxy_manager.popitem(last=False)
+                evicted.clear()
+            return manager
+
+    def resize(self, pool_size: int, max_proxies: int):
+        with self.proxy_lock:
+            self.max_proxies = max_proxies
+            if pool_size == self._pool_maxsize:
+                return
+            self._pool_connections = pool_size
+            self._pool_maxsize = pool_size
+            self.init_poolmanager(pool_size, pool_size, block=self._pool_block)
+            for manager in self.proxy_manager.values():
+                manager.clear()
+            self.proxy_manager.clear()
+
+    def close(self):
+        # Shared by every checker session, so closing one session must not drop the pools.
+        pass
+
+
+_adapter = None
+_adapter_lock = threading.Lock()
+
+
+def pool_config():
+    config = settings.get("connection_pool") or {}
+    size = int(config.get("size") or 0) or max(10, int(settings.get("threads") or 10))
+    return size, int(config.get("max_proxies", 256))
+
+
+def shared_adapter() -> PooledAdapter:
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = PooledAdapter(*pool_config())
+        return _adapter
+
+
+def configure():
+    if _adapter is not None:
+        _adapter.resize(*pool_config())
+
+
+def new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = shared_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
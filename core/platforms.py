@@ -1,14 +1,71 @@
-import requests
+import atexit
+import codecs
+import heapq
+import json
 import re
 import random
-import time
 import os
+import time
+import threading
 import importlib.util
 from abc import ABC, abstractmethod
 from config.settings import settings
+from core.concurrency import concurrency_controller
+from core.http_pool import new_session
 
 _instagram_session_cookie = ""
 
+CHECK_ERROR = "ERROR"
+
+class CheckFailed(Exception):
+    pass
+
+def is_error_status(status_code) -> bool:
+    return status_code == 429 or status_code >= 500
+
+# Unread bodies up to this size are drained so the connection goes back to the pool instead of being closed
+DRAIN_MAX_BYTES = 64 * 1024
+
+def drain_response(response):
+    # Chunked bodies have no known remainder and are closed rather than read blind
+    try:
+        length = int(response.headers["Content-Length"])
+        if length - response.raw.tell() > DRAIN_MAX_BYTES:
+            return
+        for _ in response.iter_content(chunk_size=BodyScanner.chunk_size):
+            pass
+    except Exception:
+        pass
+
+class BodyScanner:
+    chunk_size = 8192
+    overlap = 64
+
+    def __init__(self, ready=None, max_bytes: int = 0, encoding: str = None):
+        self.ready = ready
+        self.max_bytes = max_bytes
+        try:
+            self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.parts = []
+        self.size = 0
+        self.tail = ""
+
+    def feed(self, chunk: bytes) -> bool:
+        self.size += len(chunk)
+        piece = self.decoder.decode(chunk)
+        self.parts.append(piece)
+        window = self.tail + piece
+        self.tail = window[-self.overlap:]
+        if self.ready is not None and self.ready(window):
+            return True
+        return bool(self.max_bytes) and self.size >= self.max_bytes
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
 def set_instagram_session_cookie(cookie: str):
     global _instagram_session_cookie
     _instagram_session_cookie = cookie.strip() if cookie else ""
@@ -16,6 +73,56 @@ def set_instagram_session_cookie(cookie: str):
 def get_instagram_session_cookie() -> str:
     return _instagram_session_cookie
 
+class ProxyHealth:
+    __slots__ = ("success", "latency", "failures", "cooldown_until")
+
+    def __init__(self):
+        self.success = 1.0
+        self.latency = 0.0
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    @property
+    def score(self) -> float:
+        return self.success / (1.0 + self.latency)
+
+BLACKLIST_FLUSH_DELAY = 1.0
+BLACKLIST_COMPACT_MIN = 1000
+
+def is_socks_proxy(proxies) -> bool:
+    return bool(proxies) and proxies.get("http", "").startswith("socks")
+
+class ProxyPool:
+    __slots__ = ("items", "index")
+
+    def __init__(self, items=()):
+        self.items = list(dict.fromkeys(items))
+        self.index = {p: i for i, p in enumerate(self.items)}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, proxy):
+        return proxy in self.index
+
+    def add(self, proxy: str):
+        if proxy in self.index:
+            return
+        self.index[proxy] = len(self.items)
+        self.items.append(proxy)
+
+    def remove(self, proxy: str):
+        index = self.index.pop(proxy, None)
+        if index is None:
+            return
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self.index[last] = index
+
+    def choice(self) -> str:
+        return self.items[random.randrange(len(self.items))]
+
 class ProxyManager:
     _instance = None
     def __new__(cls):
@@ -26,10 +133,81 @@ class ProxyManager:
             cls._instance.proxies_file = "proxies.txt"
             cls._instance.blacklist_file = "bad_proxies.txt"
             cls._instance.socks_supported = importlib.util.find_spec('socks') is not None
+            cls._instance.lock = threading.RLock()
+            cls._instance.pools = {"": ProxyPool()}
+            cls._instance.proxy_configs = {}
+            cls._instance.proxy_by_url = {}
+            cls._instance.health = {}
+            cls._instance.bans = {}
+            cls._instance.ban_strikes = {}
+            cls._instance.cooling = []
+            cls._instance.blacklist_io_lock = threading.Lock()
+            cls._instance.blacklist_dirty = threading.Event()
+            cls._instance.blacklist_pending = []
+            cls._instance.blacklist_compact = False
+            cls._instance.blacklist_log_lines = 0
+            cls._instance.blacklist_flusher = None
+            cls._instance.proxy_stats_file = "proxy_stats.json"
+            cls._instance.proxy_stats = {}
+            cls._instance.proxy_stats_dirty = False
             cls._instance.load_proxies()
             cls._instance.load_blacklist()
+            cls._instance.load_proxy_stats()
+            atexit.register(cls._instance.flush_blacklist)
+            atexit.register(cls._instance.save_proxy_stats)
         return cls._instance
 
+    @staticmethod
+    def build_proxy_config(proxy: str) -> dict:
+        if proxy.startswith("http://") or proxy.startswith("https://") or proxy.startswith("socks"):
+            scheme_host = proxy
+        else:
+            scheme_host = f"http://{proxy}"
+        return {"http": scheme_host, "https": scheme_host}
+
+    def rebuild_pool(self):
+        with self.lock:
+            self.proxy_configs = {p: self.build_proxy_config(p) for p in self.proxies}
+            self.proxy_by_url = {config["http"]: p for p, config in self.proxy_configs.items()}
+            now = time.monotonic()
+            self.pools = {
+                platform: ProxyPool(p for p in self.proxy_configs if self._usable(p, platform, now))
+                for platform in self.pools
+            }
+
+    def _is_cooling(self, proxy: str, now: float) -> bool:
+        health = self.health.get(proxy)
+        return health is not None and health.cooldown_until > now
+
+    def _is_banned(self, proxy: str, platform: str, now: float) -> bool:
+        return bool(platform) and self.bans.get((proxy, platform), 0.0) > now
+
+    def _usable(self, proxy: str, platform: str, now: float) -> bool:
+        return (
+            proxy in self.proxy_configs
+            and proxy not in self.blacklist
+            and not self._is_cooling(proxy, now)
+            and not self._is_banned(proxy, platform, now)
+        )
+
+    def _pool(self, platform: str) -> ProxyPool:
+        pool = self.pools.get(platform)
+        if pool is None:
+            now = time.monotonic()
+            pool = ProxyPool(p for p in self.pools[""].items if not self._is_banned(p, platform, now))
+            self.pools[platform] = pool
+        return pool
+
+    def _add_to_pools(self, proxy: str):
+        now = time.monotonic()
+        for platform, pool in self.pools.items():
+            if self._usable(proxy, platform, now):
+                pool.add(proxy)
+
+    def _remove_from_pools(self, proxy: str):
+        for pool in self.pools.values():
+            pool.remove(proxy)
+
     def load_proxies(self):
         if os.path.exists(self.proxies_file):
             try:
@@ -37,6 +215,7 @@ class ProxyManager:
                     self.proxies = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
             except:
                 self.proxies = []
+        self.rebuild_pool()
 
     def save_proxies(self, path: str = "proxies.txt"):
         try:
@@ -47,31 +226,170 @@ class ProxyManager:
 
     def load_blacklist(self, path: str = None):
         path = path or self.blacklist_file
-        self.blacklist = set()
+        if path == self.blacklist_file:
+            self.flush_blacklist()
+        blacklist = set()
+        lines = 0
+        compact = False
         if os.path.exists(path):
             try:
                 with open(path, "r", encoding="utf-8") as f:
-                    self.blacklist = set([line.strip() for line in f if line.strip()])
+                    content = f.read()
+                # The file is an append-only log: "proxy" adds an entry, "-proxy" removes it.
+                for line in content.splitlines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    lines += 1
+                    if line.startswith("-"):
+                        blacklist.discard(line[1:])
+                    else:
+                        blacklist.add(line)
+                compact = bool(content) and not content.endswith("\n")
             except:
-                self.blacklist = set()
+                blacklist = set()
+        with self.lock:
+            self.blacklist = blacklist
+            if path == self.blacklist_file:
+                self.blacklist_log_lines = lines
+                self.blacklist_compact = self.blacklist_compact or compact
+        self.rebuild_pool()
 
     def save_blacklist(self, path: str = None):
         path = path or self.blacklist_file
+        if path == self.blacklist_file:
+            with self.lock:
+                self.blacklist_compact = True
+            self.flush_blacklist()
+            return
         try:
             with open(path, "w", encoding="utf-8") as f:
                 f.write("\n".join(sorted(self.blacklist)))
         except:
             pass
 
+    def _queue_blacklist(self, line: str = None):
+        with self.lock:
+            if line is None:
+                self.blacklist_pending = []
+                self.blacklist_compact = True
+            else:
+                self.blacklist_pending.append(line)
+            if self.blacklist_flusher is None:
+                self.blacklist_flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self.blacklist_flusher.start()
+        self.blacklist_dirty.set()
+
+    def _flush_loop(self):
+        while True:
+            self.blacklist_dirty.wait()
+            time.sleep(BLACKLIST_FLUSH_DELAY)
+            self.flush_blacklist()
+
+    def flush_blacklist(self):
+        with self.blacklist_io_lock:
+            with self.lock:
+                self.blacklist_dirty.clear()
+                pending, self.blacklist_pending = self.blacklist_pending, []
+                compact = self.blacklist_compact or (
+                    self.blacklist_log_lines + len(pending) > max(BLACKLIST_COMPACT_MIN, 2 * len(self.blacklist))
+                )
+                self.blacklist_compact = False
+                snapshot = sorted(self.blacklist) if compact else None
+            if not compact and not pending:
+                return
+            try:
+                if compact:
+                    tmp_path = f"{self.blacklist_file}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.writelines(f"{p}\n" for p in snapshot)
+                    os.replace(tmp_path, self.blacklist_file)
+                    self.blacklist_log_lines = len(snapshot)
+                else:
+                    with open(self.blacklist_file, "a", encoding="utf-8") as f:
+                        f.writelines(f"{line}\n" for line in pending)
+                    self.blacklist_log_lines += len(pending)
+            except OSError:
+                with self.lock:
+                    self.blacklist_compact = True
+
+    def load_proxy_stats(self):
+        stats = {}
+        if os.path.exists(self.proxy_stats_file):
+            try:
+                with open(self.proxy_stats_file, "r", encoding="utf-8") as f:
+                    stats = json.load(f)
+            except Exception:
+                stats = {}
+        with self.lock:
+            self.proxy_stats = stats if isinstance(stats, dict) else {}
+
+    def save_proxy_stats(self):
+        with self.lock:
+            if not self.proxy_stats_dirty:
+                return
+            self.proxy_stats_dirty = False
+            snapshot = dict(self.proxy_stats)
+        try:
+            tmp_path = f"{self.proxy_stats_file}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.proxy_stats_file)
+        except OSError:
+            with self.lock:
+                self.proxy_stats_dirty = True
+
+    def record_proxy_stats(self, proxy: str, ok: bool, connect: float = None, total: float = None):
+        with self.lock:
+            self.proxy_stats[proxy.strip()] = {
+                "ok": ok,
+                "connect": connect,
+                "total": total,
+                "checked_at": time.time()
+            }
+            self.proxy_stats_dirty = True
+
+    def get_proxy_stats(self, proxy: str):
+        return self.proxy_stats.get(proxy.strip())
+
+    def is_usable(self, proxies, platform: str = None) -> bool:
+        proxy = self.proxy_by_url.get(proxies.get("http"))
+        if proxy is None:
+            return False
+        with self.lock:
+            return self._usable(proxy, platform or "", time.monotonic())
+
+    def is_stale(self, proxy: str, max_age: float) -> bool:
+        stats = self.proxy_stats.get(proxy.strip())
+        return stats is None or time.time() - stats.get("checked_at", 0) > max_age
+
+    def _fastest(self, pool: ProxyPool, n: int):
+        timed = (p for p in pool.items if (self.proxy_stats.get(p) or {}).get("total") is not None)
+        return heapq.nsmallest(n, timed, key=lambda p: self.proxy_stats[p]["total"])
+
+    def fastest(self, n: int, platform: str = None):
+        with self.lock:
+            return self._fastest(self._pool(platform or ""), n)
+
     def mark_bad_proxy(self, proxy: str):
         if not proxy: return
-        self.blacklist.add(proxy.strip())
-        self.save_blacklist()
+        p = proxy.strip()
+        with self.lock:
+            if p in self.blacklist:
+                return
+            self.blacklist.add(p)
+            self._remove_from_pools(p)
+            self._queue_blacklist(p)
 
     def unmark_bad_proxy(self, proxy: str):
         try:
-            self.blacklist.discard(proxy.strip())
-            self.save_blacklist()
+            p = proxy.strip()
+            with self.lock:
+                if p not in self.blacklist:
+                    return
+                self.blacklist.discard(p)
+                self._add_to_pools(p)
+                self._queue_blacklist(f"-{p}")
         except:
             pass
 
@@ -79,152 +397,457 @@ class ProxyManager:
         return proxy.strip() in self.blacklist
 
     def clear_blacklist(self):
-        self.blacklist = set()
-        self.save_blacklist()
+        with self.lock:
+            self.blacklist = set()
+            self._queue_blacklist()
+        self.rebuild_pool()
 
     def add_proxy(self, proxy: str, path: str = "proxies.txt") -> bool:
         if not proxy: return False
         p = proxy.strip()
-        if not p or p in self.proxies:
-            return False
-        self.proxies.append(p)
+        with self.lock:
+            if not p or p in self.proxy_configs:
+                return False
+            self.proxies.append(p)
+            self.proxy_configs[p] = self.build_proxy_config(p)
+            self.proxy_by_url[self.proxy_configs[p]["http"]] = p
+            self._add_to_pools(p)
         self.save_proxies(path)
         return True
 
     def remove_proxy(self, proxy: str, path: str = "proxies.txt") -> bool:
         if not proxy: return False
         p = proxy.strip()
-        try:
-            self.proxies.remove(p)
-            self.save_proxies(path)
-            return True
-        except ValueError:
-            return False
+        with self.lock:
+            try:
+                self.proxies.remove(p)
+            except ValueError:
+                return False
+            if p not in self.proxies:
+                config = self.proxy_configs.pop(p, None)
+                if config:
+                    self.proxy_by_url.pop(config["http"], None)
+                self.health.pop(p, None)
+                self._remove_from_pools(p)
+        self.save_proxies(path)
+        return True
 
-    def get_proxy(self):
-        if not settings.get("use_proxies") or not self.proxies:
-            return None
+    def _score(self, proxy: str) -> float:
+        health = self.health.get(proxy)
+        return health.score if health is not None else 1.0
 
-        available = [p for p in self.proxies if p and p.strip() and p.strip() not in self.blacklist]
-        if not available:
-            return None
+    def _release_cooled(self, now: float):
+        while self.cooling and self.cooling[0][0] <= now:
+            _, proxy, platform = heapq.heappop(self.cooling)
+            if platform:
+                if self.bans.get((proxy, platform), 0.0) > now:
+                    continue
+                self.bans.pop((proxy, platform), None)
+                pool = self.pools.get(platform)
+                if pool is not None and self._usable(proxy, platform, now):
+                    pool.add(proxy)
+            elif not self._is_cooling(proxy, now):
+                self._add_to_pools(proxy)
 
-        proxy = random.choice(available).strip()
+    def _cooldown(self, failures: int, config: dict) -> float:
+        return min(
+            float(config.get("cooldown", 30)) * 2 ** (failures - 1),
+            float(config.get("max_cooldown", 600))
+        )
 
-        if proxy.startswith("http://") or proxy.startswith("https://") or proxy.startswith("socks"):
-            scheme_host = proxy
-        else:
-            scheme_host = f"http://{proxy}"
+    def report(self, proxies, ok: bool, latency: float, platform: str = "", banned: bool = False):
+        if not proxies:
+            return
+        proxy = self.proxy_by_url.get(proxies.get("http"))
+        if proxy is None:
+            return
+
+        config = settings.get("proxy_health") or {}
+        with self.lock:
+            if banned and platform:
+                key = (proxy, platform)
+                strikes = self.ban_strikes.get(key, 0) + 1
+                self.ban_strikes[key] = strikes
+                until = time.monotonic() + self._cooldown(strikes, config)
+                self.bans[key] = until
+                pool = self.pools.get(platform)
+                if pool is not None:
+                    pool.remove(proxy)
+                heapq.heappush(self.cooling, (until, proxy, platform))
+                return
+            if ok and platform:
+                self.ban_strikes.pop((proxy, platform), None)
+
+            alpha = float(config.get("smoothing", 0.2))
+            health = self.health.get(proxy)
+            if health is None:
+                health = self.health[proxy] = ProxyHealth()
+            health.success += alpha * ((1.0 if ok else 0.0) - health.success)
+            if ok:
+                health.latency += alpha * (latency - health.latency)
+                health.failures = 0
+                return
+
+            health.failures += 1
+            if health.failures < int(config.get("failures_before_cooldown", 2)):
+                return
+            health.cooldown_until = time.monotonic() + self._cooldown(health.failures, config)
+            self._remove_from_pools(proxy)
+            heapq.heappush(self.cooling, (health.cooldown_until, proxy, ""))
 
-        if scheme_host.startswith("socks") and not self.socks_supported:
+    def get_health(self, proxy: str):
+        return self.health.get(proxy.strip())
+
+    def is_banned(self, proxy: str, platform: str) -> bool:
+        return self._is_banned(proxy.strip(), platform, time.monotonic())
+
+    def _is_socks(self, proxy: str) -> bool:
+        return self.proxy_configs[proxy]["http"].startswith("socks")
+
+    def _choice(self, pool: ProxyPool, socks: bool):
+        if socks:
+            return pool.choice()
+        # A few random draws find a non-socks proxy in O(1) unless the pool is mostly socks
+        for _ in range(8):
+            proxy = pool.choice()
+            if not self._is_socks(proxy):
+                return proxy
+        candidates = [p for p in pool.items if not self._is_socks(p)]
+        return random.choice(candidates) if candidates else None
+
+    def get_proxy(self, platform: str = None, fastest: int = 0, socks: bool = True):
+        if not settings.get("use_proxies"):
+            return None
+
+        with self.lock:
+            if self.cooling:
+                self._release_cooled(time.monotonic())
+            pool = self._pool(platform or "")
+            if not pool:
+                return None
+            candidates = self._fastest(pool, fastest) if fastest else None
+            if candidates and not socks:
+                candidates = [p for p in candidates if not self._is_socks(p)]
+            if candidates:
+                proxy = random.choice(candidates)
+            else:
+                proxy = self._choice(pool, socks)
+                if proxy is None:
+                    return None
+                if len(pool) > 1:
+                    other = self._choice(pool, socks)
+                    if other is not None and self._score(other) > self._score(proxy):
+                        proxy = other
+            config = self.proxy_configs[proxy]
+
+        if config["http"].startswith("socks") and not self.socks_supported:
             self.mark_bad_proxy(proxy)
             return None
 
-        return {
-            "http": scheme_host,
-            "https": scheme_host
-        }
+        return config
 
 class PlatformChecker(ABC):
+    name = ""
+    needs_body = True
+    prefer_fast_proxies = False
+
     def __init__(self):
-        self.session = requests.Session()
+        self.local = threading.local()
         self.proxy_mgr = ProxyManager()
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15'
         ]
 
-    def get_request_kwargs(self):
+    def request_headers(self, user_agent=None):
+        return {
+            'User-Agent': user_agent or random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Connection': 'keep-alive'
+        }
+
+    @property
+    def session(self):
+        # One session (and cookie jar) per worker thread; connections are still pooled by the shared adapter
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = new_session()
+        return session
+
+    def pick_proxy(self, socks: bool = True):
+        fastest = int(settings.get("monitor_fastest_proxies") or 0) if self.prefer_fast_proxies else 0
+        return self.proxy_mgr.get_proxy(self.name, fastest, socks)
+
+    def get_request_kwargs(self, socks: bool = True):
         kwargs = {
-            "headers": {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Connection': 'keep-alive'
-            },
+            "headers": self.request_headers(),
             "timeout": settings.get("timeout") or 10
         }
         
-        proxy = self.proxy_mgr.get_proxy()
+        proxy = self.pick_proxy(socks)
         if proxy:
             kwargs["proxies"] = proxy
             
         return kwargs
 
-    def jitter(self):
-        min_delay = settings.get("jitter_min") or 0.1
-        max_delay = settings.get("jitter_max") or 0.5
-        time.sleep(random.uniform(min_delay, max_delay))
+    def body_needed(self, status_code, url) -> bool:
+        return self.needs_body
+
+    def new_scanner(self, username, status_code, url, encoding=None):
+        # No scanner means the status and final URL already decide the check, so the body is never read
+        if not self.body_needed(status_code, url) or self.is_banned(status_code, url) or is_error_status(status_code):
+            return None
+        return BodyScanner(
+            lambda window: self.body_ready(username, window),
+            int(settings.get("max_body_bytes") or 0),
+            encoding
+        )
+
+    def is_banned(self, status_code, url) -> bool:
+        return status_code == 429
+
+    def record_response(self, kwargs, status_code, latency, banned=False):
+        concurrency_controller.record(self.name, status_code, latency)
+        ok = status_code is not None and not is_error_status(status_code)
+        self.proxy_mgr.report(kwargs.get("proxies"), ok, latency, self.name, banned)
+
+    def fetch(self, url, username, session=None, **kwargs):
+        started = time.monotonic()
+        try:
+            response = (session or self.session).get(url, stream=True, **kwargs)
+        except Exception:
+            self.record_response(kwargs, None, time.monotonic() - started)
+            raise
+        try:
+            banned = self.is_banned(response.status_code, response.url)
+            self.record_response(kwargs, response.status_code, time.monotonic() - started, banned)
+            if banned or is_error_status(response.status_code):
+                raise CheckFailed(f"status:{response.status_code}")
+
+            scanner = self.new_scanner(username, response.status_code, response.url, response.encoding)
+            if scanner is None:
+                return response.status_code, response.url, ""
+            for chunk in response.iter_content(chunk_size=BodyScanner.chunk_size):
+                if scanner.feed(chunk):
+                    break
+            return response.status_code, response.url, scanner.text
+        finally:
+            drain_response(response)
+            response.close()
+
+    async def fetch_async(self, client, url, username, **kwargs):
+        started = time.monotonic()
+        try:
+            status_code, final_url, text = await client.fetch(
+                url,
+                scanner_factory=lambda status_code, final_url, encoding: self.new_scanner(username, status_code, final_url, encoding),
+                **kwargs
+            )
+        except Exception:
+            self.record_response(kwargs, None, time.monotonic() - started)
+            raise
+        banned = self.is_banned(status_code, final_url)
+        self.record_response(kwargs, status_code, time.monotonic() - started, banned)
+        if banned or is_error_status(status_code):
+            raise CheckFailed(f"status:{status_code}")
+        return status_code, final_url, text
+
+    def profile_url(self, username):
+        raise NotImplementedError
+
+    def body_ready(self, username, window):
+        return False
+
+    def evaluate(self, username, status_code, url, text):
+        return False
 
     @abstractmethod
     def check(self, username):
         pass
 
+    async def check_async(self, client, username):
+        try:
+            # aiohttp cannot tunnel through socks, so those proxies are left to the thread engine
+            kwargs = self.get_request_kwargs(socks=False)
+            status_code, url, text = await self.fetch_async(client, self.profile_url(username), username, **kwargs)
+            return self.evaluate(username, status_code, url, text)
+        except Exception:
+            return CHECK_ERROR
+
 class PinterestChecker(PlatformChecker):
+    name = "pinterest"
+
+    def profile_url(self, username):
+        return f"https://www.pinterest.com/{username}/"
+
+    home_urls = ("https://www.pinterest.com", "https://br.pinterest.com")
+
+    def body_needed(self, status_code, url):
+        return status_code != 404 and url.rstrip('/') not in self.home_urls
+
+    def body_ready(self, username, window):
+        return "page not found" in window.lower()
+
+    def evaluate(self, username, status_code, url, text):
+        if url.rstrip('/') in self.home_urls:
+            return True
+            
+        if status_code == 404:
+            return True
+        
+        content = text.lower()
+        if "page not found" in content:
+            return True
+            
+        return False
+
     def check(self, username):
-        self.jitter()
-        url = f"https://www.pinterest.com/{username}/"
         try:
             kwargs = self.get_request_kwargs()
-            response = self.session.get(url, **kwargs)
-            
-            if response.url.rstrip('/') in ["https://www.pinterest.com", "https://br.pinterest.com"]:
-                return True
-                
-            if response.status_code == 404:
-                return True
-            
-            content = response.text.lower()
-            if "page not found" in content:
-                return True
-                
-            return False
+            status_code, url, text = self.fetch(self.profile_url(username), username, **kwargs)
+            return self.evaluate(username, status_code, url, text)
         except:
-            return False
+            return CHECK_ERROR
 
 class GitHubChecker(PlatformChecker):
+    name = "github"
+    needs_body = False
+
+    def profile_url(self, username):
+        return f"https://github.com/{username}"
+
+    def evaluate(self, username, status_code, url, text):
+        if status_code == 404:
+            return True
+            
+        return False
+
     def check(self, username):
-        self.jitter()
-        url = f"https://github.com/{username}"
         try:
             kwargs = self.get_request_kwargs()
-            response = self.session.get(url, **kwargs)
-            
-            if response.status_code == 404:
-                return True
-                
-            return False
+            status_code, url, text = self.fetch(self.profile_url(username), username, **kwargs)
+            return self.evaluate(username, status_code, url, text)
         except:
-            return False
+            return CHECK_ERROR
+
+class StickySession:
+    __slots__ = ("proxies", "session", "cookies", "session_cookie", "user_agent", "uses")
+
+    def __init__(self, proxies, session, session_cookie, user_agent):
+        self.proxies = proxies
+        self.session = session
+        self.cookies = {}
+        self.session_cookie = session_cookie
+        self.user_agent = user_agent
+        self.uses = 0
 
 class InstagramChecker(PlatformChecker):
+    name = "instagram"
+
+    def __init__(self):
+        super().__init__()
+        self.sticky_lock = threading.Lock()
+        self.sticky_idle = []
+
+    def new_sticky(self, socks: bool = True) -> StickySession:
+        cookie = get_instagram_session_cookie().strip()
+        sticky = StickySession(
+            self.pick_proxy(socks),
+            new_session(),
+            cookie,
+            random.choice(self.user_agents)
+        )
+        if cookie:
+            sticky.session.cookies.set('sessionid', cookie, domain='instagram.com', path='/')
+            sticky.cookies['sessionid'] = cookie
+        return sticky
+
+    def sticky_valid(self, sticky: StickySession) -> bool:
+        if sticky.session_cookie != get_instagram_session_cookie().strip():
+            return False
+        if not settings.get("use_proxies"):
+            return sticky.proxies is None
+        return sticky.proxies is not None and self.proxy_mgr.is_usable(sticky.proxies, self.name)
+
+    def acquire_sticky(self, socks: bool = True) -> StickySession:
+        with self.sticky_lock:
+            for i in range(len(self.sticky_idle) - 1, -1, -1):
+                sticky = self.sticky_idle[i]
+                if not socks and is_socks_proxy(sticky.proxies):
+                    continue
+                del self.sticky_idle[i]
+                if self.sticky_valid(sticky):
+                    return sticky
+        return self.new_sticky(socks)
+
+    def release_sticky(self, sticky: StickySession, ok: bool):
+        # A proxy keeps its cookie jar for a batch of checks, then both are replaced
+        sticky.uses += 1
+        if ok and sticky.uses < int(settings.get("instagram_sticky_checks") or 1):
+            with self.sticky_lock:
+                self.sticky_idle.append(sticky)
+
+    def sticky_kwargs(self, sticky: StickySession):
+        kwargs = {"headers": self.request_headers(sticky.user_agent), "timeout": 10}
+        if sticky.proxies:
+            kwargs["proxies"] = sticky.proxies
+        return kwargs
+
+    def profile_url(self, username):
+        return f"https://www.instagram.com/{username}"
+
+    def is_banned(self, status_code, url) -> bool:
+        return status_code == 429 or "/accounts/login" in url or "/challenge" in url
+
+    def body_ready(self, username, window):
+        place = window.find(username)
+        return place != -1 and len(window) >= place + 10
+
+    def evaluate(self, username, status_code, url, text):
+        content = text
+        if username in content:
+            place = content.find(username)
+            find = content[place - 9 : place + 10]
+            is_available = find[1:4] == "url"
+            
+            if is_available and len(username) < 5:
+                return "POSSIBLY_AVAILABLE"
+            
+            return is_available
+        else:
+            return False
+
     def check(self, username):
-        self.jitter()
         username = username.lower().strip()
         
         if not username or len(username) < 1 or len(username) > 30:
             return False
         
-        self._setup_instagram_session()
-        
+        sticky = self.acquire_sticky()
+        ok = False
         try:
-            response = self.session.get(f"https://www.instagram.com/{username}", timeout=10)
-            content = response.text
-            if username in content:
-                place = content.find(username)
-                find = content[place - 9 : place + 10]
-                is_available = find[1:4] == "url"
-                
-                if is_available and len(username) < 5:
-                    return "POSSIBLY_AVAILABLE"
-                
-                return is_available
-            else:
-                return False
+            status_code, url, text = self.fetch(self.profile_url(username), username, session=sticky.session, **self.sticky_kwargs(sticky))
+            ok = True
+            return self.evaluate(username, status_code, url, text)
         except Exception as e:
+            return CHECK_ERROR
+        finally:
+            self.release_sticky(sticky, ok)
+
+    async def check_async(self, client, username):
+        username = username.lower().strip()
+        
+        if not username or len(username) < 1 or len(username) > 30:
             return False
-    
-    def _setup_instagram_session(self):
-        cookie = get_instagram_session_cookie()
-        if cookie and cookie.strip():
-            self.session.cookies.set('sessionid', cookie, domain='instagram.com', path='/')
\ No newline at end of file
+        
+        sticky = self.acquire_sticky(socks=False)
+        ok = False
+        try:
+            status_code, url, text = await self.fetch_async(client, self.profile_url(username), username, cookies=sticky.cookies, **self.sticky_kwargs(sticky))
+            ok = True
+            return self.evaluate(username, status_code, url, text)
+        except Exception:
+            return CHECK_ERROR
+        finally:
+            self.release_sticky(sticky, ok)
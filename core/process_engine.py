@@ -0,0 +1,146 @@
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+from core.engine import AuditEngine
+from core.async_engine import AIOHTTP_AVAILABLE, AsyncAuditEngine, create_engine
+from config.settings import settings
+
+
+def _share_rate_limits(processes):
+    limits = settings.get("rate_limits") or {}
+    settings.data["rate_limits"] = {
+        platform: {**config, "rate": float(config.get("rate", 0)) / processes}
+        for platform, config in limits.items()
+    }
+
+
+def _engine_concurrency():
+    if settings.get("engine") == "async" and AIOHTTP_AVAILABLE:
+        return int(settings.get("async_concurrency") or 500)
+    return int(settings.get("threads") or 10)
+
+
+def _worker_main(processes, overrides, inbox, outbox, stop_event):
+    for key, value in overrides.items():
+        settings.override(key, value)
+    _share_rate_limits(processes)
+    engine = create_engine(allow_processes=False)
+
+    def watch_stop():
+        while not stop_event.is_set():
+            time.sleep(0.5)
+        engine.stop()
+
+    threading.Thread(target=watch_stop, daemon=True).start()
+
+    completed = {}
+
+    def next_item():
+        while not stop_event.is_set():
+            try:
+                return inbox.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return None
+
+    def targets():
+        for username, done in iter(next_item, None):
+            if done:
+                completed[username] = done
+            yield username
+
+    async def async_targets():
+        # The inbox blocks, so the event loop waits for it on an executor thread
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await loop.run_in_executor(None, next_item)
+            if item is None:
+                break
+            username, done = item
+            if done:
+                completed[username] = done
+            yield username
+
+    source = async_targets() if isinstance(engine, AsyncAuditEngine) else targets()
+    try:
+        engine.start_bulk(source, outbox.put, completed)
+    finally:
+        outbox.put(None)
+
+
+class ProcessAuditEngine(AuditEngine):
+    def __init__(self):
+        super().__init__()
+        self._stop_event = None
+        self.workers = []
+
+    def _feed(self, usernames, completed, inbox, processes):
+        try:
+            for item in self.iter_targets(usernames, completed):
+                while self.active:
+                    try:
+                        inbox.put(item, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if not self.active:
+                    break
+        finally:
+            for _ in range(processes):
+                try:
+                    inbox.put(None, timeout=1)
+                except queue.Full:
+                    pass
+
+    def start_bulk(self, usernames, callback, completed=None):
+        self.active = True
+        self.monitor_mode = False
+        self.refresh_settings()
+        processes = max(1, int(settings.get("processes") or 1))
+        window = _engine_concurrency() * processes * 2
+
+        ctx = multiprocessing.get_context("spawn")
+        self._stop_event = ctx.Event()
+        inbox = ctx.Queue(maxsize=window)
+        outbox = ctx.Queue()
+        self.workers = [
+            ctx.Process(target=_worker_main, args=(processes, settings.overrides, inbox, outbox, self._stop_event), daemon=True)
+            for _ in range(processes)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+        feeder = threading.Thread(target=self._feed, args=(usernames, completed, inbox, processes), daemon=True)
+        feeder.start()
+
+        remaining = processes
+        try:
+            while remaining:
+                try:
+                    data = outbox.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in self.workers):
+                        break
+                    continue
+                if data is None:
+                    remaining -= 1
+                    continue
+                if self.active:
+                    try:
+                        callback(data)
+                    except Exception:
+                        pass
+        finally:
+            self._stop_event.set()
+            for worker in self.workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            self.workers = []
+
+    def stop(self):
+        self.active = False
+        if self._stop_event is not None:
+            self._stop_event.set()
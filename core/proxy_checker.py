@@ -1,9 +1,23 @@
+import asyncio
 import concurrent.futures
 import requests
 import os
-from typing import List, Tuple
+import socket
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urlsplit
+from config.settings import settings
 from core.platforms import ProxyManager
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
 DEFAULT_TEST_URL = "https://httpbin.org/ip"
 
 
@@ -23,37 +37,175 @@ def build_proxies(proxy: str) -> dict:
     return {"http": scheme_host, "https": scheme_host}
 
 
-def check_proxy(proxy: str, test_url: str = DEFAULT_TEST_URL, timeout: int = 8) -> Tuple[str, bool, str]:
+def record_timings(proxy: str, ok: bool, connects: List[float], totals: List[float]):
+    pm = ProxyManager()
+    if totals:
+        pm.record_proxy_stats(proxy, ok, statistics.median(connects), statistics.median(totals))
+    else:
+        pm.record_proxy_stats(proxy, ok)
+
+
+def connect_time(proxy_url: str, timeout: float) -> float:
+    parts = urlsplit(proxy_url)
+    started = time.perf_counter()
+    with socket.create_connection((parts.hostname, parts.port or 80), timeout=timeout):
+        return time.perf_counter() - started
+
+
+def check_proxy(proxy: str, test_url: str = DEFAULT_TEST_URL, timeout: int = 8, samples: int = 1) -> Tuple[str, bool, str]:
     proxies = build_proxies(proxy)
-    try:
-        resp = requests.get(test_url, proxies=proxies, timeout=timeout)
-        if resp.status_code == 200:
-            return proxy, True, resp.text.strip()
-        return proxy, False, f"status:{resp.status_code}"
-    except Exception as e:
-        return proxy, False, str(e)
+    connects, totals = [], []
+    result = None
+    for _ in range(max(1, samples)):
+        try:
+            connect = connect_time(proxies["http"], timeout)
+            started = time.perf_counter()
+            resp = requests.get(test_url, proxies=proxies, timeout=timeout)
+            total = time.perf_counter() - started
+            if resp.status_code != 200:
+                result = result or (proxy, False, f"status:{resp.status_code}")
+                break
+            connects.append(connect)
+            totals.append(total)
+            result = (proxy, True, resp.text.strip())
+        except Exception as e:
+            result = result or (proxy, False, str(e))
+            break
+    record_timings(proxy, result[1], connects, totals)
+    return result
 
 
-def check_proxies(proxies: List[str], workers: int = 10, test_url: str = DEFAULT_TEST_URL, timeout: int = 8) -> List[Tuple[str, bool, str]]:
+def record_result(result: Tuple[str, bool, str], callback: Optional[Callable] = None):
+    proxy, ok, _ = result
+    pm = ProxyManager()
+    if ok:
+        if pm.is_blacklisted(proxy):
+            pm.unmark_bad_proxy(proxy)
+    else:
+        pm.mark_bad_proxy(proxy)
+    if callback:
+        try:
+            callback(result)
+        except Exception:
+            pass
+
+
+def check_proxies(proxies: List[str], workers: int = 10, test_url: str = DEFAULT_TEST_URL, timeout: int = 8, samples: int = 1, callback: Optional[Callable] = None) -> List[Tuple[str, bool, str]]:
     results = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, max(1, len(proxies)))) as ex:
-        futures = {ex.submit(check_proxy, p, test_url, timeout): p for p in proxies}
+        futures = {ex.submit(check_proxy, p, test_url, timeout, samples): p for p in proxies}
         for fut in concurrent.futures.as_completed(futures):
             try:
-                results.append(fut.result())
+                result = fut.result()
             except Exception as e:
                 p = futures.get(fut, "unknown")
-                results.append((p, False, str(e)))
-    pm = ProxyManager()
-    for proxy, ok, _ in results:
-        if ok:
-            if pm.is_blacklisted(proxy):
-                pm.unmark_bad_proxy(proxy)
-        else:
-            pm.mark_bad_proxy(proxy)
+                result = (p, False, str(e))
+            results.append(result)
+            record_result(result, callback)
+    ProxyManager().save_proxy_stats()
+    return results
+
+
+def connect_trace_config():
+    async def on_start(session, context, params):
+        context.trace_request_ctx.connect_started = time.perf_counter()
+
+    async def on_end(session, context, params):
+        timing = context.trace_request_ctx
+        timing.connect = time.perf_counter() - timing.connect_started
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(on_start)
+    trace_config.on_connection_create_end.append(on_end)
+    return trace_config
+
+
+async def check_proxy_async(session, proxy: str, test_url: str = DEFAULT_TEST_URL, timeout: int = 8, connect_timeout: float = 3, samples: int = 1) -> Tuple[str, bool, str]:
+    proxy_url = build_proxies(proxy)["http"]
+    if proxy_url.startswith("socks"):
+        # aiohttp has no socks support, fall back to requests on a worker thread
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, check_proxy, proxy, test_url, timeout, samples)
+
+    connects, totals = [], []
+    result = None
+    for _ in range(max(1, samples)):
+        timing = SimpleNamespace(connect_started=None, connect=None)
+        started = time.perf_counter()
+        try:
+            # sock_connect makes dead hosts fail at the TCP stage instead of waiting out the full timeout
+            async with session.get(
+                test_url,
+                proxy=proxy_url,
+                timeout=aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout),
+                trace_request_ctx=timing
+            ) as resp:
+                if resp.status != 200:
+                    result = result or (proxy, False, f"status:{resp.status}")
+                    break
+                text = (await resp.text()).strip()
+        except asyncio.TimeoutError:
+            result = result or (proxy, False, "timeout")
+            break
+        except Exception as e:
+            result = result or (proxy, False, str(e) or type(e).__name__)
+            break
+        total = time.perf_counter() - started
+        connects.append(timing.connect if timing.connect is not None else total)
+        totals.append(total)
+        result = (proxy, True, text)
+    record_timings(proxy, result[1], connects, totals)
+    return result
+
+
+async def _check_proxies_async(proxies, concurrency, test_url, timeout, connect_timeout, samples, callback, results):
+    source = iter(proxies)
+    connector = aiohttp.TCPConnector(limit=concurrency, force_close=True)
+    async with aiohttp.ClientSession(connector=connector, trace_configs=[connect_trace_config()]) as session:
+        async def worker():
+            for proxy in source:
+                result = await check_proxy_async(session, proxy, test_url, timeout, connect_timeout, samples)
+                results.append(result)
+                record_result(result, callback)
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, max(1, len(proxies))))))
+
+
+def check_proxies_async(proxies: List[str], concurrency: int = 1000, test_url: str = DEFAULT_TEST_URL, timeout: int = 8, connect_timeout: float = 3, samples: int = 1, callback: Optional[Callable] = None) -> List[Tuple[str, bool, str]]:
+    if not AIOHTTP_AVAILABLE:
+        raise RuntimeError("aiohttp is required for async proxy checks")
+    results = []
+    try:
+        asyncio.run(_check_proxies_async(proxies, concurrency, test_url, timeout, connect_timeout, samples, callback, results))
+    finally:
+        ProxyManager().save_proxy_stats()
     return results
 
 
+def validate_proxies(proxies: List[str], callback: Optional[Callable] = None, only_stale: bool = False) -> List[Tuple[str, bool, str]]:
+    config = settings.get("proxy_check") or {}
+    if only_stale:
+        pm = ProxyManager()
+        max_age = float(config.get("max_age", 21600))
+        proxies = [p for p in proxies if pm.is_stale(p, max_age)]
+        if not proxies:
+            return []
+    test_url = config.get("test_url") or DEFAULT_TEST_URL
+    timeout = config.get("timeout", 8)
+    samples = int(config.get("samples", 3))
+    if AIOHTTP_AVAILABLE:
+        return check_proxies_async(
+            proxies,
+            concurrency=int(config.get("concurrency", 1000)),
+            test_url=test_url,
+            timeout=timeout,
+            connect_timeout=config.get("connect_timeout", 3),
+            samples=samples,
+            callback=callback
+        )
+    return check_proxies(proxies, workers=min(50, max(5, len(proxies))), test_url=test_url, timeout=timeout, samples=samples, callback=callback)
+
+
 def save_results(results: List[Tuple[str, bool, str]], good_path: str = "good_proxies.txt", bad_path: str = "bad_proxies.txt"):
     good = [p for p, ok, _ in results if ok]
     bad = [p for p, ok, _ in results if not ok]
@@ -71,8 +223,11 @@ def print_summary(results: List[Tuple[str, bool, str]]):
     print(f"Checked: {len(results)} - OK: {len(ok)} - FAIL: {len(fail)}")
     if ok:
         print("\nGood proxies:")
+        pm = ProxyManager()
         for p, _, info in ok:
-            print(f"  {p} -> {info}")
+            stats = pm.get_proxy_stats(p) or {}
+            speed = f" ({stats['total'] * 1000:.0f} ms)" if stats.get("total") is not None else ""
+            print(f"  {p}{speed} -> {info}")
     if fail:
         print("\nBad proxies:")
         for p, _, info in fail:
@@ -87,6 +242,9 @@ if __name__ == "__main__":
     parser.add_argument("--workers", "-w", type=int, default=20, help="Number of concurrent workers")
     parser.add_argument("--test-url", "-u", default=DEFAULT_TEST_URL, help="URL to test through proxy")
     parser.add_argument("--timeout", "-t", type=int, default=8, help="Timeout seconds for each test")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use aiohttp and test --workers proxies at once")
+    parser.add_argument("--connect-timeout", "-c", type=float, default=3, help="Seconds to wait for the TCP connection (async only)")
+    parser.add_argument("--samples", "-s", type=int, default=1, help="Requests per proxy; the median time is kept")
     args = parser.parse_args()
 
     proxies = load_proxies(args.file)
@@ -95,13 +253,10 @@ if __name__ == "__main__":
         raise SystemExit(1)
 
     print(f"Testing {len(proxies)} proxies against {args.test_url} with {args.workers} workers...")
-    results = check_proxies(proxies, workers=args.workers, test_url=args.test_url, timeout=args.timeout)
-    print_summary(results)
-    save_results(results)
-    print("Saved good_proxies.txt and bad_proxies.txt")
-
-    print(f"Testing {len(proxies)} proxies against {args.test_url} with {args.workers} workers...")
-    results = check_proxies(proxies, workers=args.workers, test_url=args.test_url, timeout=args.timeout)
+    if args.use_async:
+        results = check_proxies_async(proxies, concurrency=args.workers, test_url=args.test_url, timeout=args.timeout, connect_timeout=args.connect_timeout, samples=args.samples)
+    else:
+        results = check_proxies(proxies, workers=args.workers, test_url=args.test_url, timeout=args.timeout, samples=args.samples)
     print_summary(results)
     save_results(results)
     print("Saved good_proxies.txt and bad_proxies.txt")
@@ -0,0 +1,117 @@
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+from config.settings import settings
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, platform: str) -> TokenBucket:
+        bucket = self.buckets.get(platform)
+        if bucket is None:
+            with self.lock:
+                bucket = self.buckets.get(platform)
+                if bucket is None:
+                    limits = settings.get(f"rate_limits.{platform}") or {}
+                    bucket = TokenBucket(limits.get("rate", 0), limits.get("burst", 1))
+                    self.buckets[platform] = bucket
+        return bucket
+
+    def reserve(self, platform: str) -> float:
+        return self.bucket(platform).reserve()
+
+    async def acquire_async(self, platform: str):
+        await self.bucket(platform).acquire_async()
+
+    def reload(self):
+        with self.lock:
+            self.buckets = {}
+
+
+class DelayedSubmitter:
+    # Holds work back until its tokens are due, so thread pool workers never sleep on a rate limit
+    def __init__(self):
+        self.queue = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def submit(self, delay: float, executor, fn, *args) -> concurrent.futures.Future:
+        if delay <= 0:
+            return executor.submit(fn, *args)
+        future = concurrent.futures.Future()
+        with self.condition:
+            heapq.heappush(self.queue, (time.monotonic() + delay, next(self.counter), future, executor, fn, args))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="rate-limit-submitter", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return future
+
+    def _next(self):
+        with self.condition:
+            while True:
+                if not self.queue:
+                    self.condition.wait()
+                    continue
+                wait = self.queue[0][0] - time.monotonic()
+                if wait <= 0:
+                    return heapq.heappop(self.queue)[2:]
+                self.condition.wait(wait)
+
+    def _run(self):
+        while True:
+            future, executor, fn, args = self._next()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                inner = executor.submit(fn, *args)
+            except RuntimeError as e:
+                future.set_exception(e)
+                continue
+            inner.add_done_callback(lambda done, future=future: self._resolve(future, done))
+
+    @staticmethod
+    def _resolve(future, done):
+        if done.cancelled():
+            future.set_exception(concurrent.futures.CancelledError())
+        elif done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            future.set_result(done.result())
+
+
+rate_limiter = RateLimiter()
+delayed_submitter = DelayedSubmitter()
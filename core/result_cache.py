@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from config.settings import settings
+from utils.database import db
+
+ABSENT_TTL = 60
+
+
+class ResultCache:
+    def __init__(self, loader=None):
+        self.entries = OrderedDict()
+        # Usernames whose history was loaded recently; any platform not in entries has no cached result
+        self.loaded = OrderedDict()
+        self.lock = threading.Lock()
+        self.loader = loader
+        self.configure()
+
+    def configure(self):
+        config = settings.get("result_cache") or {}
+        self.enabled = bool(config.get("enabled"))
+        self.max_entries = int(config.get("max_entries", 100000))
+        self.ttls = config.get("ttl") or {}
+        with self.lock:
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            while len(self.loaded) > self.max_entries:
+                self.loaded.popitem(last=False)
+
+    def ttl(self, platform: str, result) -> int:
+        status = "taken" if result is False else "available"
+        return int(self.ttls.get(platform, {}).get(status, 0))
+
+    def _store(self, key, value, expires):
+        self.entries[key] = (value, expires)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _lookup(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires <= now:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _recently_loaded(self, name: str, now: float) -> bool:
+        expires = self.loaded.get(name)
+        if expires is None:
+            return False
+        if expires <= now:
+            del self.loaded[name]
+            return False
+        return True
+
+    def _load(self, username: str, now: float):
+        max_age = max([self.ttl(p, r) for p in self.ttls for r in (True, False)] or [0])
+        if max_age <= 0:
+            return
+        try:
+            history = self.loader(username, max_age)
+        except Exception:
+            return
+
+        name = username.lower()
+        with self.lock:
+            for hist_platform, (available, checked_at) in history.items():
+                value = "POSSIBLY_AVAILABLE" if available else False
+                expires = checked_at + self.ttl(hist_platform, value)
+                key = (name, hist_platform)
+                if expires > now and key not in self.entries:
+                    self._store(key, value, expires)
+            # One query answers every platform, so a name without history is not looked up again per platform
+            self.loaded[name] = now + ABSENT_TTL
+            self.loaded.move_to_end(name)
+            while len(self.loaded) > self.max_entries:
+                self.loaded.popitem(last=False)
+
+    def get(self, username: str, platform: str):
+        if not self.enabled:
+            return None
+
+        name = username.lower()
+        key = (name, platform)
+        now = time.time()
+        with self.lock:
+            entry = self._lookup(key, now)
+            load = entry is None and self.loader is not None and not self._recently_loaded(name, now)
+
+        if load:
+            self._load(username, now)
+            with self.lock:
+                entry = self._lookup(key, now)
+
+        return None if entry is None else entry[0]
+
+    def put(self, username: str, platform: str, result):
+        if not self.enabled:
+            return
+        ttl = self.ttl(platform, result)
+        if ttl <= 0:
+            return
+        with self.lock:
+            self._store((username.lower(), platform), result, time.time() + ttl)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.loaded.clear()
+
+
+result_cache = ResultCache(loader=db.get_recent_platform_results)
@@ -16,11 +16,13 @@ from utils.notifications import notification_manager
 from utils.animations import AnimationEngine
 from utils.validators import InputValidator
 from utils.database import db
-from core.engine import AuditEngine
+from core.async_engine import create_engine
+from core.engine import live_platforms
 from config.settings import settings
 from config.theme_manager import get_theme_manager
 from core.platforms import ProxyManager
-from core.proxy_checker import check_proxies
+from core.proxy_checker import validate_proxies
+from core.checked_index import checked_index
 
 
 class AppWindow:
@@ -154,14 +156,17 @@ class AppWindow:
         except Exception:
             pass
         
-        self.engine = AuditEngine()
+        self.engine = create_engine()
         self.targets: List[str] = []
         self.results_cache: List[Dict[str, Any]] = []
         self.session_id = str(uuid.uuid4())
+        self.resume_completed: Optional[Dict[str, set]] = None
+        self.bulk_total = 0
         self.stat_total = tk.IntVar(value=0)
         self.stat_avail = tk.IntVar(value=0)
         self.stat_rate = tk.StringVar(value="0%")
         self.stat_speed = tk.StringVar(value="0/s")
+        self.stat_concurrency = tk.StringVar(value="")
         self.hide_taken = tk.BooleanVar(value=False)
         self.auto_export = tk.BooleanVar(value=False)
         self.use_proxies = tk.BooleanVar(value=settings.get("use_proxies", False))
@@ -188,6 +193,8 @@ class AppWindow:
         except Exception as e:
             pass
         self.root.after(60000, self.auto_save)
+        self.root.after(500, self._offer_resume)
+        checked_index.refresh_in_background()
     
     def _disable_focus_globally(self, widget):
         try:
@@ -1046,6 +1053,12 @@ class AppWindow:
             font=('Segoe UI', 8)
         ).pack(side=tk.LEFT)
         
+        ttk.Label(
+            speed_frame,
+            textvariable=self.stat_concurrency,
+            font=('Segoe UI', 8)
+        ).pack(side=tk.LEFT, padx=(8, 0))
+        
         ttk.Label(
             footer_content,
             text="v1.0.2",
@@ -1071,10 +1084,20 @@ class AppWindow:
             
             self.targets = []
             chars = string.ascii_lowercase + string.digits
+            platforms = self.get_enabled_platforms()
             
-            for _ in range(count):
-                username = "".join(random.choices(chars, k=length))
+            def candidates():
+                for _ in range(count * 20):
+                    yield "".join(random.choices(chars, k=length))
+            
+            seen = set()
+            for username in checked_index.filter_unchecked(candidates(), platforms):
+                if username in seen:
+                    continue
+                seen.add(username)
                 self.targets.append(username)
+                if len(self.targets) >= count:
+                    break
             
             self._log_to_console(f"Generated {len(self.targets)} usernames", "success")
             Toast.show(self.root, f"Generated {len(self.targets)} usernames", "success")
@@ -1095,32 +1118,95 @@ class AppWindow:
             with open(file_path, 'r', encoding='utf-8') as f:
                 usernames = [line.strip() for line in f if line.strip()]
             
-            self.targets = usernames
-            self._log_to_console(f"Imported {len(usernames)} usernames from file", "success")
-            Toast.show(self.root, f"Imported {len(usernames)} usernames", "success")
+            self.targets = list(checked_index.filter_unchecked(usernames, self.get_enabled_platforms()))
+            skipped = len(usernames) - len(self.targets)
+            if skipped:
+                self._log_to_console(f"Skipped {skipped} usernames already checked on the selected platforms", "info")
+            self._log_to_console(f"Imported {len(self.targets)} usernames from file", "success")
+            Toast.show(self.root, f"Imported {len(self.targets)} usernames", "success")
             
         except Exception as e:
             Toast.show(self.root, f"Error importing file: {str(e)}", "error")
     
+    def _offer_resume(self):
+        # Loading a large interrupted session takes a while, so it is read on a worker thread
+        def worker():
+            try:
+                pending = db.get_resumable_session()
+                if not pending:
+                    return
+                completed = db.get_completed_checks(pending['id'])
+                targets = db.get_session_targets(pending['id'])
+            except Exception:
+                return
+            self.root.after(0, lambda: self._ask_resume(pending, completed, targets))
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _ask_resume(self, pending, completed, targets):
+        if str(self.bulk_start_btn['state']) == 'disabled':
+            return
+        
+        message = (
+            f"A previous bulk check was interrupted ({len(completed)} of {pending['total_targets']} "
+            f"usernames checked).\n\nResume it now?"
+        )
+        if not messagebox.askyesno("Resume Bulk Check", message):
+            def worker():
+                try:
+                    db.end_session(pending['id'])
+                except Exception:
+                    pass
+            threading.Thread(target=worker, daemon=True).start()
+            return
+        
+        self.session_id = pending['id']
+        self.targets = targets
+        self.resume_completed = completed
+        self._log_to_console(f"Resuming session {self.session_id[:8]}... ({len(completed)} already checked)", "info")
+        self.start_bulk()
+    
+    def _begin_bulk_session(self):
+        if not db.is_session_unused(self.session_id):
+            self.session_id = str(uuid.uuid4())
+            db.create_session(self.session_id, {
+                'platforms': self.get_enabled_platforms(),
+                'use_proxies': self.use_proxies.get()
+            })
+        db.save_session_targets(self.session_id, self.targets)
+    
     def start_bulk(self):
         if not self.targets:
             Toast.show(self.root, "No usernames to check! Generate or import first.", "warning")
             return
         self.save_config()
+        completed, self.resume_completed = self.resume_completed, None
         self.stat_total.set(0)
         self.stat_avail.set(0)
         self.results_cache.clear()
         self.start_time = datetime.now().timestamp()
         self.bulk_start_btn.config(state='disabled')
         self.status_label.config(text="Bulk check running...")
+        self.bulk_total = max(0, len(self.targets) - len(completed or {}))
         self.progress_bar['value'] = 0
-        self.progress_bar['maximum'] = len(self.targets)
-        thread = threading.Thread(target=self.run_bulk_check, daemon=True)
+        self.progress_bar['maximum'] = self.bulk_total
+        thread = threading.Thread(target=self.run_bulk_check, args=(completed,), daemon=True)
         thread.start()
     
-    def run_bulk_check(self):
-        self.engine.start_bulk(self.targets, self.handle_check_result)
+    def run_bulk_check(self, completed=None):
+        # Session bookkeeping writes one row per target, so it stays off the Tk thread
+        if completed is None:
+            try:
+                self._begin_bulk_session()
+            except Exception:
+                pass
+        self.engine.start_bulk(self.targets, self.handle_check_result, completed)
+        if self.engine.active:
+            try:
+                db.end_session(self.session_id)
+            except Exception:
+                pass
         self.root.after(0, self.finish_bulk_check)
+        checked_index.refresh_in_background()
     
     def handle_check_result(self, data: Dict[str, Any]):
         self.root.after(0, lambda: self._update_stats(data))
@@ -1140,12 +1226,14 @@ class AppWindow:
                 message = f"[{timestamp}] {username:<15} | Possibly available on: {platforms}"
                 tag = "warning"
             
-            db.save_check_result(
-                username,
-                data['checked_platforms'],
-                available if available else possibly_available,
-                self.session_id
-            )
+            checked = live_platforms(data)
+            if checked:
+                db.save_check_result(
+                    username,
+                    checked,
+                    live_platforms(data, available if available else possibly_available),
+                    self.session_id
+                )
             
             self.root.after(0, lambda m=message, t=tag: self._log_to_console(m, t))
             
@@ -1157,12 +1245,14 @@ class AppWindow:
             if not self.hide_taken.get():
                 message = f"[{timestamp}] {username:<15} | Taken"
                 self.root.after(0, lambda m=message: self._log_to_console(m, "fail"))
-            db.save_check_result(
-                username,
-                data['checked_platforms'],
-                [],
-                self.session_id
-            )
+            checked = live_platforms(data)
+            if checked:
+                db.save_check_result(
+                    username,
+                    checked,
+                    [],
+                    self.session_id
+                )
     
     def _update_stats(self, data: Dict[str, Any]):
         new_total = self.stat_total.get() + 1
@@ -1174,16 +1264,22 @@ class AppWindow:
             rate = (self.stat_avail.get() / new_total) * 100
             self.stat_rate.set(f"{rate:.1f}%")
         self.progress_bar['value'] = new_total
-        if len(self.targets) > 0:
-            percent = (new_total / len(self.targets)) * 100
+        if self.bulk_total > 0:
+            percent = (new_total / self.bulk_total) * 100
             self.progress_percent.config(text=f"{percent:.0f}%")
-            self.progress_label.config(text=f"Checking... {new_total}/{len(self.targets)}")
+            self.progress_label.config(text=f"Checking... {new_total}/{self.bulk_total}")
         
         if self.start_time:
             elapsed = datetime.now().timestamp() - self.start_time
             if elapsed > 0:
                 speed = new_total / elapsed
                 self.stat_speed.set(f"{speed:.1f}/s")
+        metrics = self.engine.get_metrics()
+        if metrics:
+            self.stat_concurrency.set(" | ".join(
+                f"{platform.title()} {m['limit']} (p95 {m['p95']:.1f}s, err {m['error_rate'] * 100:.0f}%)"
+                for platform, m in metrics.items()
+            ))
         try:
             db.update_session_stats(self.session_id, new_total, self.stat_avail.get())
         except Exception:
@@ -1204,11 +1300,6 @@ class AppWindow:
             "success",
             5000
         )
-        
-        try:
-            db.end_session(self.session_id)
-        except Exception:
-            pass
     
     def stop_audit(self):
         self.engine.stop()
@@ -1369,7 +1460,9 @@ class AppWindow:
             else:
                 good_count += 1
             
-            self.proxy_tree.insert('', 'end', values=(proxy, status, "-"), tags=(tag,))
+            stats = self.proxy_mgr.get_proxy_stats(proxy) or {}
+            speed = f"{stats['total'] * 1000:.0f} ms" if stats.get("total") is not None else "-"
+            self.proxy_tree.insert('', 'end', values=(proxy, status, speed), tags=(tag,))
         
         total = len(proxies)
         self.proxy_stats_label.config(
@@ -1416,7 +1509,7 @@ class AppWindow:
         Toast.show(self.root, f"Checking {len(proxies)} proxies...", "info")
         
         def worker():
-            results = check_proxies(proxies, workers=min(50, max(5, len(proxies))))
+            results = validate_proxies(proxies)
             ok = sum(1 for r in results if r[1])
             bad = len(results) - ok
             
@@ -1426,7 +1519,6 @@ class AppWindow:
                 "success"
             ))
             
-            self.proxy_mgr.load_blacklist()
             self.root.after(0, self.refresh_proxy_list)
         
         threading.Thread(target=worker, daemon=True).start()
@@ -6,12 +6,12 @@ from gui.app_window import AppWindow
 
 def _validate_startup_proxies():
     try:
-        from core.proxy_checker import load_proxies, check_proxies
+        from core.proxy_checker import load_proxies, validate_proxies
         proxies = load_proxies("proxies.txt")
         if proxies:
             def _worker():
                 try:
-                    check_proxies(proxies, workers=min(50, max(5, len(proxies))))
+                    validate_proxies(proxies, only_stale=True)
                 except Exception as e:
                     pass
 
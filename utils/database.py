@@ -1,9 +1,20 @@
+import atexit
+import queue
 import sqlite3
+import sys
 import json
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 
+SCHEMA_VERSION = 1
+WRITE_BATCH_SIZE = 500
+STATS_FLUSH_INTERVAL = 2.0
+DELETE_BATCH_SIZE = 10000
+VACUUM_PAGES = 2000
+
 
 class Database:
     
@@ -12,14 +23,210 @@ class Database:
         
         self.db_path = db_path
         self.conn: Optional[sqlite3.Connection] = None
+        self.write_queue: "queue.Queue" = queue.Queue()
+        self.writer: Optional[threading.Thread] = None
+        self.writer_lock = threading.Lock()
+        self.session_stats: Dict[str, Tuple[int, int]] = {}
+        self.stats_lock = threading.Lock()
+        self.stats_flushed_at = 0.0
+        self.retention_days = 0
+        self.monitor_retention_days = 0
+        self.maintenance_interval = 3600.0
+        # The first pass runs one interval after startup, never on the first batch of a run
+        self.maintained_at = time.monotonic()
+        self.vacuum_warned = False
         self.create_tables()
+        self.migrate()
+        atexit.register(self.flush)
+    
+    def open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
     
     def connect(self) -> sqlite3.Connection:
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            self.conn = self.open_connection()
         return self.conn
     
+    def start_writer(self):
+        with self.writer_lock:
+            if self.writer is None or not self.writer.is_alive():
+                self.writer = threading.Thread(target=self._write_loop, daemon=True)
+                self.writer.start()
+    
+    def _write_loop(self):
+        conn = self.open_connection()
+        try:
+            while True:
+                try:
+                    item = self.write_queue.get(timeout=STATS_FLUSH_INTERVAL)
+                except queue.Empty:
+                    self._write_session_stats(conn)
+                    self._maybe_maintain(conn)
+                    continue
+                if item is None:
+                    self.write_queue.task_done()
+                    return
+                batch = [item]
+                stop = False
+                while len(batch) < WRITE_BATCH_SIZE:
+                    try:
+                        item = self.write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                
+                try:
+                    self._write_batch(conn, batch)
+                except Exception:
+                    conn.rollback()
+                finally:
+                    for _ in range(len(batch) + stop):
+                        self.write_queue.task_done()
+                if time.monotonic() - self.stats_flushed_at >= STATS_FLUSH_INTERVAL:
+                    self._write_session_stats(conn)
+                self._maybe_maintain(conn)
+                if stop:
+                    return
+        finally:
+            conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        with conn:
+            platform_rows = []
+            for username, timestamp, checked_at, platforms_checked, platforms_available, session_id in batch:
+                cursor = conn.execute('''
+                    INSERT INTO check_results (username, timestamp, platforms_checked, platforms_available, session_id)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (username, timestamp, json.dumps(platforms_checked), json.dumps(platforms_available), session_id))
+                platform_rows.extend(
+                    (cursor.lastrowid, username, platform, 'available' if platform in platforms_available else 'taken', checked_at, session_id)
+                    for platform in platforms_checked
+                )
+            conn.executemany('''
+                INSERT INTO platform_results (check_id, username, platform, status, checked_at, session_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', platform_rows)
+    
+    def _write_session_stats(self, conn: sqlite3.Connection):
+        with self.stats_lock:
+            pending, self.session_stats = self.session_stats, {}
+            self.stats_flushed_at = time.monotonic()
+            if not pending:
+                return
+            try:
+                with conn:
+                    conn.executemany('''
+                        UPDATE sessions 
+                        SET total_checked = ?, total_available = ?
+                        WHERE id = ?
+                    ''', [(checked, available, session_id) for session_id, (checked, available) in pending.items()])
+            except sqlite3.Error:
+                pass
+    
+    def configure(self, config: Dict[str, Any]):
+        self.retention_days = int(config.get('retention_days', 0))
+        self.monitor_retention_days = int(config.get('monitor_retention_days', 0))
+        self.maintenance_interval = float(config.get('maintenance_interval', 3600))
+    
+    def _maybe_maintain(self, conn: sqlite3.Connection):
+        if time.monotonic() - self.maintained_at < self.maintenance_interval:
+            return
+        self.maintained_at = time.monotonic()
+        try:
+            self.run_maintenance(conn)
+        except sqlite3.Error:
+            conn.rollback()
+    
+    def run_maintenance(self, conn: Optional[sqlite3.Connection] = None):
+        conn = conn or self.connect()
+        self.rollup_daily_stats(conn)
+        self._delete_in_batches(conn, '''
+            DELETE FROM session_targets WHERE rowid IN (
+                SELECT t.rowid FROM session_targets t JOIN sessions s ON s.id = t.session_id
+                WHERE s.ended_at IS NOT NULL LIMIT ?
+            )
+        ''')
+        if self.retention_days > 0:
+            cutoff = f'-{self.retention_days} days'
+            self._delete_in_batches(conn, '''
+                DELETE FROM session_targets WHERE rowid IN (
+                    SELECT t.rowid FROM session_targets t JOIN sessions s ON s.id = t.session_id
+                    WHERE s.started_at < datetime('now', ?) LIMIT ?
+                )
+            ''', cutoff)
+            self._delete_in_batches(conn, '''
+                DELETE FROM platform_results WHERE id IN (
+                    SELECT id FROM platform_results
+                    WHERE checked_at < CAST(strftime('%s', 'now', ?) AS INTEGER) LIMIT ?
+                )
+            ''', cutoff)
+            self._delete_in_batches(conn, '''
+                DELETE FROM check_results WHERE id IN (
+                    SELECT id FROM check_results WHERE timestamp < datetime('now', ?) LIMIT ?
+                )
+            ''', cutoff)
+        if self.monitor_retention_days > 0:
+            self._delete_in_batches(conn, '''
+                DELETE FROM monitor_history WHERE id IN (
+                    SELECT id FROM monitor_history WHERE timestamp < datetime('now', ?) LIMIT ?
+                )
+            ''', f'-{self.monitor_retention_days} days')
+        self.incremental_vacuum(conn)
+    
+    def rollup_daily_stats(self, conn: sqlite3.Connection):
+        # Completed days only; today is always read from the raw tables
+        last = conn.execute('SELECT MAX(day) FROM daily_stats').fetchone()[0]
+        start = conn.execute("SELECT date(?, '+1 day')", (last,)).fetchone()[0] if last else '0000-01-01'
+        with conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO daily_stats (day, total_checks, total_available, unique_usernames)
+                SELECT date(r.timestamp), COUNT(*),
+                       COUNT(CASE WHEN EXISTS (
+                           SELECT 1 FROM platform_results p WHERE p.check_id = r.id AND p.status = 'available'
+                       ) THEN 1 END),
+                       COUNT(DISTINCT r.username)
+                FROM check_results r
+                WHERE r.timestamp >= ? AND r.timestamp < date('now')
+                GROUP BY date(r.timestamp)
+            ''', (start,))
+    
+    def _delete_in_batches(self, conn: sqlite3.Connection, query: str, *params):
+        while True:
+            with conn:
+                deleted = conn.execute(query, (*params, DELETE_BATCH_SIZE)).rowcount
+            if deleted < DELETE_BATCH_SIZE:
+                return
+    
+    def incremental_vacuum(self, conn: sqlite3.Connection):
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            # Switching modes takes a full VACUUM, which would block the writer; compact() does it on request
+            if not self.vacuum_warned:
+                self.vacuum_warned = True
+                print(f"{self.db_path} predates incremental vacuum; run `python cli.py --compact-db` to convert it", file=sys.stderr)
+            return
+        conn.execute(f'PRAGMA incremental_vacuum({VACUUM_PAGES})').fetchall()
+    
+    def compact(self):
+        # One-time full VACUUM that also switches older databases to incremental auto_vacuum
+        self.flush()
+        conn = self.connect()
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+    
+    def flush(self):
+        if self.writer is not None and self.writer.is_alive():
+            self.write_queue.join()
+        if self.session_stats:
+            self._write_session_stats(self.connect())
+    
     def create_tables(self):
         conn = self.connect()
         cursor = conn.cursor()
@@ -46,6 +253,66 @@ class Database:
             )
         ''')
         
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS session_targets (
+                session_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                PRIMARY KEY (session_id, position)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_check_results_session
+            ON check_results (session_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_check_results_username
+            ON check_results (username, timestamp)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_check_results_timestamp
+            ON check_results (timestamp)
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS platform_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                check_id INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                status TEXT NOT NULL,
+                checked_at INTEGER NOT NULL,
+                session_id TEXT
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_platform_results_username
+            ON platform_results (username, platform, checked_at)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_platform_results_checked_at
+            ON platform_results (checked_at, status)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_platform_results_check
+            ON platform_results (check_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                day TEXT PRIMARY KEY,
+                total_checks INTEGER NOT NULL,
+                total_available INTEGER NOT NULL,
+                unique_usernames INTEGER NOT NULL
+            )
+        ''')
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS monitor_history (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -68,24 +335,42 @@ class Database:
         
         conn.commit()
     
-    def save_check_result(self, username: str, platforms_checked: List[str], 
-                         platforms_available: List[str], session_id: Optional[str] = None):
+    def migrate(self):
         conn = self.connect()
-        cursor = conn.cursor()
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
         
-        cursor.execute('''
-            INSERT INTO check_results (username, platforms_checked, platforms_available, session_id)
-            VALUES (?, ?, ?, ?)
-        ''', (
+        with conn:
+            if version < 1:
+                # Split the JSON platform lists of existing rows into platform_results
+                conn.execute('''
+                    INSERT INTO platform_results (check_id, username, platform, status, checked_at, session_id)
+                    SELECT r.id, r.username, c.value,
+                           CASE WHEN EXISTS (SELECT 1 FROM json_each(r.platforms_available) a WHERE a.value = c.value)
+                                THEN 'available' ELSE 'taken' END,
+                           CAST(strftime('%s', r.timestamp) AS INTEGER),
+                           r.session_id
+                    FROM check_results r, json_each(r.platforms_checked) c
+                    WHERE NOT EXISTS (SELECT 1 FROM platform_results p WHERE p.check_id = r.id)
+                ''')
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    
+    def save_check_result(self, username: str, platforms_checked: List[str], 
+                         platforms_available: List[str], session_id: Optional[str] = None):
+        self.start_writer()
+        now = time.time()
+        self.write_queue.put((
             username,
-            json.dumps(platforms_checked),
-            json.dumps(platforms_available),
+            time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now)),
+            int(now),
+            list(platforms_checked),
+            list(platforms_available),
             session_id
         ))
-        
-        conn.commit()
     
     def get_check_history(self, limit: int = 100, username: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.flush()
         conn = self.connect()
         cursor = conn.cursor()
         
@@ -116,6 +401,36 @@ class Database:
         
         return results
     
+    def get_recent_platform_results(self, username: str, max_age_seconds: int) -> Dict[str, Tuple[bool, float]]:
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT platform, status, MAX(checked_at) AS checked_at
+            FROM platform_results
+            WHERE username = ? AND checked_at >= ?
+            GROUP BY platform
+        ''', (username, int(time.time()) - int(max_age_seconds)))
+        
+        return {
+            row['platform']: (row['status'] == 'available', float(row['checked_at']))
+            for row in cursor.fetchall()
+        }
+    
+    def get_platform_results_since(self, after_id: int, limit: int = 50000) -> List[Tuple[int, str, str]]:
+        self.flush()
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, username, platform FROM platform_results
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, limit))
+        
+        return [(row['id'], row['username'], row['platform']) for row in cursor.fetchall()]
+    
     def create_session(self, session_id: str, config: Dict[str, Any]):
         conn = self.connect()
         cursor = conn.cursor()
@@ -128,21 +443,13 @@ class Database:
         conn.commit()
     
     def update_session_stats(self, session_id: str, total_checked: int, total_available: int):
-        try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE sessions 
-                SET total_checked = ?, total_available = ?
-                WHERE id = ?
-            ''', (total_checked, total_available, session_id))
-            
-            conn.commit()
-        except sqlite3.Error:
-            self.conn = None
+        # Counters are coalesced in memory; the writer thread saves them every STATS_FLUSH_INTERVAL seconds
+        with self.stats_lock:
+            self.session_stats[session_id] = (total_checked, total_available)
+        self.start_writer()
     
     def end_session(self, session_id: str):
+        self.flush()
         conn = self.connect()
         cursor = conn.cursor()
         
@@ -151,9 +458,89 @@ class Database:
             SET ended_at = CURRENT_TIMESTAMP
             WHERE id = ?
         ''', (session_id,))
+        # Targets are only kept to resume an interrupted session
+        cursor.execute('DELETE FROM session_targets WHERE session_id = ?', (session_id,))
         
         conn.commit()
     
+    def save_session_targets(self, session_id: str, usernames: List[str]):
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM session_targets WHERE session_id = ?', (session_id,))
+        cursor.executemany('''
+            INSERT INTO session_targets (session_id, position, username)
+            VALUES (?, ?, ?)
+        ''', ((session_id, position, username) for position, username in enumerate(usernames)))
+        
+        conn.commit()
+    
+    def is_session_unused(self, session_id: str) -> bool:
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        # Ended sessions lose their targets, so both checks are needed to tell a fresh session apart
+        cursor.execute('''
+            SELECT 1 FROM sessions s
+            WHERE s.id = ? AND s.ended_at IS NULL
+              AND NOT EXISTS (SELECT 1 FROM session_targets t WHERE t.session_id = s.id)
+        ''', (session_id,))
+        return cursor.fetchone() is not None
+    
+    def get_session_targets(self, session_id: str) -> List[str]:
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT username FROM session_targets
+            WHERE session_id = ?
+            ORDER BY position
+        ''', (session_id,))
+        
+        return [row['username'] for row in cursor.fetchall()]
+    
+    def get_completed_checks(self, session_id: str) -> Dict[str, set]:
+        self.flush()
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT username, platforms_checked FROM check_results
+            WHERE session_id = ?
+        ''', (session_id,))
+        
+        completed: Dict[str, set] = {}
+        for row in cursor.fetchall():
+            completed.setdefault(row['username'], set()).update(json.loads(row['platforms_checked']))
+        
+        return completed
+    
+    def get_resumable_session(self) -> Optional[Dict[str, Any]]:
+        self.flush()
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT s.id, s.started_at, s.total_checked,
+                   (SELECT COUNT(*) FROM session_targets t WHERE t.session_id = s.id) AS total_targets
+            FROM sessions s
+            WHERE s.ended_at IS NULL
+              AND EXISTS (SELECT 1 FROM session_targets t WHERE t.session_id = s.id)
+            ORDER BY s.started_at DESC
+            LIMIT 1
+        ''')
+        
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        
+        return {
+            'id': row['id'],
+            'started_at': row['started_at'],
+            'total_checked': row['total_checked'],
+            'total_targets': row['total_targets']
+        }
+    
     def add_to_favorites(self, username: str, platforms: List[str], notes: str = ""):
         conn = self.connect()
         cursor = conn.cursor()
@@ -187,28 +574,66 @@ class Database:
         return results
     
     def get_statistics(self, days: int = 7) -> Dict[str, Any]:
+        self.flush()
         conn = self.connect()
         cursor = conn.cursor()
         
+        # Whole days come from daily_stats, days not rolled up yet from raw rows. Per-day unique
+        # counts can't be added up across days, so unique usernames are always counted from raw rows;
+        # the window is capped at the retention period so that count covers the same days as the totals.
+        if self.retention_days > 0:
+            days = min(days, self.retention_days)
         cursor.execute('''
-            SELECT 
-                COUNT(*) as total_checks,
-                COUNT(CASE WHEN platforms_available != '[]' THEN 1 END) as total_available,
-                COUNT(DISTINCT username) as unique_usernames
-            FROM check_results
-            WHERE timestamp >= datetime('now', '-' || ? || ' days')
+            SELECT date('now', '-' || ? || ' days') AS window_start,
+                   (SELECT date(MAX(day), '+1 day') FROM daily_stats) AS live_start
         ''', (days,))
+        bounds = cursor.fetchone()
+        window_start = bounds['window_start']
+        live_start = max(window_start, bounds['live_start'] or window_start)
         
-        row = cursor.fetchone()
+        cursor.execute('''
+            SELECT COALESCE(SUM(total_checks), 0) AS total_checks,
+                   COALESCE(SUM(total_available), 0) AS total_available
+            FROM daily_stats
+            WHERE day >= ? AND day < ?
+        ''', (window_start, live_start))
+        rolled = cursor.fetchone()
+        
+        cursor.execute('''
+            SELECT 
+                (SELECT COUNT(*) FROM check_results
+                 WHERE timestamp >= :start) as total_checks,
+                (SELECT COUNT(DISTINCT check_id) FROM platform_results
+                 WHERE checked_at >= CAST(strftime('%s', :start) AS INTEGER)
+                   AND status = 'available') as total_available
+        ''', {'start': live_start})
+        live = cursor.fetchone()
+        
+        cursor.execute('''
+            SELECT COUNT(DISTINCT username) FROM check_results
+            WHERE timestamp >= ?
+        ''', (window_start,))
+        unique_usernames = cursor.fetchone()[0]
+        
+        total_checks = rolled['total_checks'] + live['total_checks']
+        total_available = rolled['total_available'] + live['total_available']
         
         return {
-            'total_checks': row['total_checks'],
-            'total_available': row['total_available'],
-            'unique_usernames': row['unique_usernames'],
-            'success_rate': (row['total_available'] / row['total_checks'] * 100) if row['total_checks'] > 0 else 0
+            'days': days,
+            'total_checks': total_checks,
+            'total_available': total_available,
+            'unique_usernames': unique_usernames,
+            'success_rate': (total_available / total_checks * 100) if total_checks > 0 else 0
         }
     
     def close(self):
+        with self.writer_lock:
+            writer, self.writer = self.writer, None
+        if writer is not None and writer.is_alive():
+            self.write_queue.put(None)
+            writer.join()
+        if self.session_stats:
+            self._write_session_stats(self.connect())
         if self.conn:
             self.conn.close()
             self.conn = None